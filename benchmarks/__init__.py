@@ -1,3 +1,3 @@
 """Benchmarking package for cryptographic performance analysis"""
 
-__all__ = ['timing_profiler', 'memory_profiler', 'benchmark_runner']
+__all__ = ['timing_profiler', 'memory_profiler', 'process_pool', 'benchmark_runner']
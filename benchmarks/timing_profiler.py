@@ -2,18 +2,136 @@
 High-resolution timing profiler for cryptographic operations
 
 This module provides precise execution time measurements using
-time.perf_counter() with warm-up rounds to avoid CPU scaling bias.
+time.perf_counter_ns() with warm-up rounds to avoid CPU scaling bias.
 """
+import gc
+import math
+import os
 import time
-import statistics
-from typing import Callable, Dict, List
+from contextlib import contextmanager
+from itertools import repeat
+import numpy as np
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; NumPy reductions are used instead
+    njit = None
+
+
+def _summary_stats_numpy(times_ns: np.ndarray) -> Tuple[float, float, float, float]:
+    """Mean, sample std, min and max of a nanosecond array (NumPy path)"""
+    std = float(times_ns.std(ddof=1)) if times_ns.size > 1 else 0.0
+    return float(times_ns.mean()), std, float(times_ns.min()), float(times_ns.max())
+
+
+def _summary_stats_loop(times_ns):
+    """Mean, sample std, min and max of a nanosecond array in a single pass"""
+    n = times_ns.size
+    total = 0.0
+    total_sq = 0.0
+    lowest = times_ns[0]
+    highest = times_ns[0]
+    for i in range(n):
+        value = times_ns[i]
+        total += value
+        total_sq += float(value) * float(value)
+        if value < lowest:
+            lowest = value
+        if value > highest:
+            highest = value
+    mean = total / n
+    std = 0.0
+    if n > 1:
+        var = (total_sq - n * mean * mean) / (n - 1)
+        std = math.sqrt(max(var, 0.0))
+    return mean, std, float(lowest), float(highest)
+
+
+# JIT-compiled once (and cached on disk) when Numba is installed
+if njit is not None:
+    _summary_stats = njit(cache=True)(_summary_stats_loop)
+else:
+    _summary_stats = _summary_stats_numpy
+
+
+@contextmanager
+def _stable_measurement():
+    """
+    Reduce timing noise around a measurement loop
+    
+    Pins the process to one of its allowed CPUs and raises its priority
+    where the OS permits (Linux), and keeps the cyclic garbage collector
+    from pausing inside the loop. Everything is restored on exit.
+    """
+    saved_affinity = None
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            saved_affinity = os.sched_getaffinity(0)
+            # First allowed CPU, so already-pinned pool workers keep their core
+            os.sched_setaffinity(0, {min(saved_affinity)})
+        except OSError:
+            saved_affinity = None
+    
+    # Restored to the exact saved value: os.nice(-5) can be clamped at the
+    # top of the range, so undoing it with os.nice(5) could overshoot
+    saved_priority = None
+    if hasattr(os, 'setpriority'):
+        try:
+            saved_priority = os.getpriority(os.PRIO_PROCESS, 0)
+            os.setpriority(os.PRIO_PROCESS, 0, max(-20, saved_priority - 5))
+        except OSError:
+            saved_priority = None  # Raising priority needs elevated privileges
+    
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if saved_priority is not None:
+            os.setpriority(os.PRIO_PROCESS, 0, saved_priority)
+        if saved_affinity is not None:
+            os.sched_setaffinity(0, saved_affinity)
+
+
+def _time_loop(func: Callable, warmup: int, iterations: int) -> Tuple[np.ndarray, Any]:
+    """
+    Run warm-up and timed calls of func in a single frame
+    
+    Returns:
+        Tuple of (int64 array of per-call durations in nanoseconds,
+        return value of the last timed call)
+    """
+    # Local rebinds keep the loops on fast locals
+    perf_counter_ns = time.perf_counter_ns
+    
+    # Integer nanosecond timestamps into a preallocated buffer keep the
+    # timed loop free of float boxing and list growth
+    times_ns = np.empty(iterations, dtype=np.int64)
+    
+    # Warm-up rounds to stabilize CPU frequency and cache
+    for _ in repeat(None, warmup):
+        func()
+    
+    result = None
+    for i in range(iterations):
+        start = perf_counter_ns()
+        result = func()
+        times_ns[i] = perf_counter_ns() - start
+    
+    return times_ns, result
 
 
 def measure_execution_time(
     func: Callable, 
     iterations: int = 10000, 
-    warmup: int = 100
-) -> Dict[str, float]:
+    warmup: int = 100,
+    return_last_result: bool = False,
+    batch: int = 1
+) -> Union[Dict[str, float], Tuple[Dict[str, float], Any]]:
     """
     Measure execution time with warm-up rounds and statistical analysis
     
@@ -21,14 +139,21 @@ def measure_execution_time(
         func: The function to benchmark (should be a lambda/callable)
         iterations: Number of iterations to measure (default: 10000)
         warmup: Number of warm-up iterations to discard (default: 100)
+        return_last_result: Also return what the last timed call returned,
+            so callers can reuse its output (default: False)
+        batch: Calls of func per timed sample (default: 1). Each sample is
+            divided by batch, which amortizes Python call and timer overhead
+            for very cheap operations. This reports per-operation cost,
+            not per-call tail latency.
     
     Returns:
-        Dictionary containing:
+        Dictionary containing (all per single func call):
         - 'mean_us': Mean execution time in microseconds
         - 'std_us': Standard deviation in microseconds
         - 'min_us': Minimum execution time in microseconds
         - 'max_us': Maximum execution time in microseconds
         - 'median_us': Median execution time in microseconds
+        With return_last_result=True, a tuple of (stats, last_result).
     
     Example:
         >>> def encrypt_op():
@@ -36,35 +161,37 @@ def measure_execution_time(
         >>> stats = measure_execution_time(encrypt_op, iterations=1000)
         >>> print(f"Mean: {stats['mean_us']:.2f} μs")
     """
-    # Warm-up rounds to stabilize CPU frequency and cache
+    timed = func
+    if batch > 1:
+        def timed(func=func, calls=batch - 1):
+            for _ in repeat(None, calls):
+                func()
+            return func()
+    
     print(f"  Running {warmup} warm-up iterations...")
-    for _ in range(warmup):
-        func()
+    if batch > 1:
+        print(f"  Measuring {iterations} iterations (batches of {batch})...")
+    else:
+        print(f"  Measuring {iterations} iterations...")
+    with _stable_measurement():
+        times_ns, last_result = _time_loop(timed, warmup, iterations)
     
-    # Actual measurement
-    print(f"  Measuring {iterations} iterations...")
-    times: List[float] = []
+    # Reduce once over the raw nanoseconds, then convert to per-call microseconds
+    mean_ns, std_ns, min_ns, max_ns = _summary_stats(times_ns)
+    median_ns = float(np.median(times_ns))  # partition-based, no full sort
+    scale = 1e-3 / batch
     
-    for i in range(iterations):
-        start = time.perf_counter()
-        func()
-        end = time.perf_counter()
-        times.append(end - start)
-        
-        # Progress indicator for long runs
-        if (i + 1) % 1000 == 0:
-            print(f"    Progress: {i + 1}/{iterations}")
-    
-    # Convert to microseconds for better readability
-    times_us = [t * 1_000_000 for t in times]
-    
-    return {
-        'mean_us': statistics.mean(times_us),
-        'std_us': statistics.stdev(times_us) if len(times_us) > 1 else 0,
-        'min_us': min(times_us),
-        'max_us': max(times_us),
-        'median_us': statistics.median(times_us)
+    stats = {
+        'mean_us': mean_ns * scale,
+        'std_us': std_ns * scale,
+        'min_us': min_ns * scale,
+        'max_us': max_ns * scale,
+        'median_us': median_ns * scale
     }
+    
+    if return_last_result:
+        return stats, last_result
+    return stats
 
 
 def calculate_throughput(mean_time_seconds: float) -> float:
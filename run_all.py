@@ -10,9 +10,15 @@ This script runs the complete benchmark suite and generates all outputs:
 """
 import os
 import sys
-import subprocess
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).parent
+
+# Benchmark and visualization modules are imported in-process; the
+# benchmark modules import their sibling profilers by bare name
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
 
 def check_venv():
     """Verify we're running in virtual environment"""
@@ -52,32 +58,50 @@ def check_dependencies():
     return True
 
 
-def run_benchmarks():
+def _run_script(script: str) -> bool:
+    """Run a script in a separate interpreter (original isolation behavior)"""
+    import subprocess
+    
+    result = subprocess.run([sys.executable, script], cwd=PROJECT_ROOT)
+    return result.returncode == 0
+
+
+def run_benchmarks(use_subprocess: bool = False):
     """Execute benchmark suite"""
     print("\n" + "="*60)
     print("Running Cryptographic Benchmarks")
     print("="*60)
     
-    result = subprocess.run(
-        [sys.executable, "benchmarks/benchmark_runner.py"],
-        cwd=Path(__file__).parent
-    )
+    if use_subprocess:
+        return _run_script("benchmarks/benchmark_runner.py")
     
-    return result.returncode == 0
+    try:
+        from benchmarks import benchmark_runner
+        benchmark_runner.main()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        return False
+    
+    return True
 
 
-def generate_visualizations():
+def generate_visualizations(use_subprocess: bool = False):
     """Generate graphs from results"""
     print("\n" + "="*60)
     print("Generating Visualization Graphs")
     print("="*60)
     
-    result = subprocess.run(
-        [sys.executable, "src/visualize_results.py"],
-        cwd=Path(__file__).parent
-    )
+    if use_subprocess:
+        return _run_script("src/visualize_results.py")
     
-    return result.returncode == 0
+    try:
+        from src import visualize_results
+        visualize_results.main()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        return False
+    
+    return True
 
 
 def print_final_summary():
@@ -97,7 +121,7 @@ def print_final_summary():
     ]
     
     for filepath, description in outputs:
-        full_path = Path(__file__).parent / filepath
+        full_path = PROJECT_ROOT / filepath
         if full_path.exists():
             print(f"  ✓ {filepath:<40} - {description}")
         else:
@@ -113,6 +137,12 @@ def print_final_summary():
 
 def main():
     """Main orchestration"""
+    # --subprocess runs each stage in its own interpreter, as before
+    use_subprocess = "--subprocess" in sys.argv[1:]
+    
+    # Result paths are relative to the project root
+    os.chdir(PROJECT_ROOT)
+    
     print("\n" + "="*70)
     print("  ASCON-128 vs AES-128-GCM Bicycle Lock Benchmark Suite")
     print("  IF4020 Cryptography - Performance Analysis")
@@ -127,12 +157,12 @@ def main():
         sys.exit(1)
     
     # Run benchmark suite
-    if not run_benchmarks():
+    if not run_benchmarks(use_subprocess):
         print("\n✗ Benchmark execution failed!")
         sys.exit(1)
     
     # Generate visualizations
-    if not generate_visualizations():
+    if not generate_visualizations(use_subprocess):
         print("\n✗ Visualization generation failed!")
         sys.exit(1)
     
@@ -16,15 +16,83 @@ Features:
 import os
 import sys
 import json
-from typing import Dict, Optional
-from datetime import datetime
+import hashlib
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.crypto_engine.ascon_wrapper import AsconLock
-from src.crypto_engine.aes_wrapper import AESLock
+from src.crypto_engine.aes_wrapper import AESLock, AESNI_AVAILABLE
+from src.crypto_engine.base_cipher import BaseCipher
+
+
+# Binary unlock command: 8-byte tag, Unix timestamp (ns), then the bike ID
+UNLOCK_TAG = b"UNLOCK\x00\x00"
+UNLOCK_HEADER = struct.Struct("!8sQ")
+
+
+def _cpu_flags() -> Set[str]:
+    """Lower-case CPU feature flags, or an empty set if they cannot be read"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    
+    if sys.platform == "darwin":
+        import subprocess
+        try:
+            result = subprocess.run(["sysctl", "-n", "machdep.cpu.features"],
+                                    capture_output=True, text=True)
+            return set(result.stdout.lower().split())
+        except OSError:
+            pass
+    
+    return set()
+
+
+def detect_best_algorithm() -> str:
+    """
+    Pick the faster AEAD for this CPU
+    
+    AES-GCM when the CPU has AES-NI and carry-less multiply (PCLMULQDQ),
+    ASCON otherwise (e.g. ARM without crypto extensions).
+    """
+    if AESNI_AVAILABLE or {"aes", "pclmulqdq"} <= _cpu_flags():
+        return "AES"
+    return "ASCON"
+
+
+class BikeRecord(NamedTuple):
+    """Per-bike values computed once at registration"""
+    key: bytes            # 128-bit encryption key
+    aad: bytes            # Associated data: manufacturer ID + bike ID
+    bike_id_bytes: bytes  # Encoded bike ID carried in tokens
+
+
+class UnlockToken(NamedTuple):
+    """Unlock token handed to the rider and presented back to the lock"""
+    bike_id: bytes
+    nonce: bytes
+    ciphertext: bytes
+    algorithm: bytes
+    
+    def __getitem__(self, key):
+        # Also readable as token["nonce"], like the former dict tokens
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
 
 
 class BicycleLockSystem:
@@ -37,26 +105,44 @@ class BicycleLockSystem:
     - Authentication and decryption verification
     """
     
-    def __init__(self, algorithm: str = "ASCON"):
+    # Successful verifications are remembered for re-presented tokens
+    VERIFY_CACHE_SIZE = 1024
+    VERIFY_CACHE_TTL_NS = 30 * 1_000_000_000
+    
+    __slots__ = ('auto_selected', 'algorithm', 'database', 'lock_manufacturer_id',
+                 '_ciphers', '_verified', '_verified_lock', '_last_token')
+    
+    def __init__(self, algorithm: Optional[str] = None):
         """
         Initialize the bicycle lock system
         
         Args:
-            algorithm: "ASCON" or "AES" (default: ASCON)
+            algorithm: "ASCON" or "AES" (default: detected from CPU features)
         """
+        self.auto_selected = algorithm is None
+        if algorithm is None:
+            algorithm = detect_best_algorithm()
         self.algorithm = algorithm.upper()
-        self.database: Dict[str, bytes] = {}  # bike_id -> key mapping
+        self.database: Dict[str, BikeRecord] = {}  # bike_id -> key/AAD record
         self.lock_manufacturer_id = b"SecureBikeLock_v1.0"
         
-        # Initialize cipher based on algorithm choice
-        self._create_cipher_instance()
+        # Fail on an unknown algorithm now, not at the first registration
+        if self.algorithm not in ("ASCON", "AES"):
+            raise ValueError(f"Unsupported algorithm: {self.algorithm}")
+        
+        # Per-bike cipher cache (bike_id -> cipher keyed with that bike's key)
+        self._ciphers: Dict[str, BaseCipher] = {}
         
-    def _create_cipher_instance(self, key: Optional[bytes] = None):
+        # LRU of authenticated (bike_id, nonce, ciphertext digest) -> expiry
+        self._verified: "OrderedDict[Tuple[str, bytes, bytes], int]" = OrderedDict()
+        self._verified_lock = threading.Lock()
+        
+    def _create_cipher_instance(self, key: Optional[bytes] = None) -> BaseCipher:
         """Create a cipher instance based on algorithm selection"""
         if self.algorithm == "ASCON":
-            self.cipher = AsconLock(key)
+            return AsconLock(key)
         elif self.algorithm == "AES":
-            self.cipher = AESLock(key)
+            return AESLock(key)
         else:
             raise ValueError(f"Unsupported algorithm: {self.algorithm}")
     
@@ -75,11 +161,17 @@ class BicycleLockSystem:
         
         # Generate random 128-bit key for this bicycle
         encryption_key = os.urandom(16)
-        self.database[bike_id] = encryption_key
+        bike_id_bytes = bike_id.encode()
+        self.database[bike_id] = BikeRecord(
+            key=encryption_key,
+            aad=self.lock_manufacturer_id + bike_id_bytes,
+            bike_id_bytes=bike_id_bytes
+        )
+        self._ciphers[bike_id] = self._create_cipher_instance(encryption_key)
         
         return True
     
-    def generate_unlock_token(self, bike_id: str) -> Optional[Dict[str, bytes]]:
+    def generate_unlock_token(self, bike_id: str) -> Optional[UnlockToken]:
         """
         Generate secure unlock token for authorized user
         
@@ -87,70 +179,113 @@ class BicycleLockSystem:
             bike_id: Bicycle identifier
             
         Returns:
-            Dictionary with nonce and ciphertext, or None if bike not registered
+            UnlockToken with nonce and ciphertext, or None if bike not registered
         """
-        if bike_id not in self.database:
+        record = self.database.get(bike_id)
+        if record is None:
             return None
-        
-        # Get bicycle's encryption key
-        key = self.database[bike_id]
-        self._create_cipher_instance(key)
+        cipher = self._ciphers[bike_id]
         
         # Create unlock command
-        timestamp = datetime.now().isoformat()
-        unlock_command = f"UNLOCK:{bike_id}:{timestamp}".encode()
+        unlock_command = (UNLOCK_HEADER.pack(UNLOCK_TAG, time.time_ns())
+                          + record.bike_id_bytes)
         
-        # Associated data: lock manufacturer ID + bike ID
-        associated_data = self.lock_manufacturer_id + bike_id.encode()
+        # Encrypt with AEAD (associated data: lock manufacturer ID + bike ID)
+        nonce, ciphertext = cipher.encrypt_command(unlock_command, record.aad)
         
-        # Encrypt with AEAD
-        nonce, ciphertext = self.cipher.encrypt_command(unlock_command, associated_data)
-        
-        return {
-            "bike_id": bike_id.encode(),
-            "nonce": nonce,
-            "ciphertext": ciphertext,
-            "algorithm": self.algorithm.encode()
-        }
-    
-    def verify_unlock_token(self, token: Dict[str, bytes]) -> bool:
+        return UnlockToken(record.bike_id_bytes, nonce, ciphertext,
+                           self.algorithm.encode())
+    
+    def verify_unlock_token(self, token: UnlockToken) -> bool:
         """
         Verify unlock token and authenticate the request
         
         Args:
-            token: Token dictionary from generate_unlock_token()
+            token: UnlockToken from generate_unlock_token()
             
         Returns:
             True if authentication successful, False otherwise
         """
-        bike_id = token["bike_id"].decode()
+        bike_id = token.bike_id.decode()
         
-        if bike_id not in self.database:
+        record = self.database.get(bike_id)
+        if record is None:
             return False
+        cipher = self._ciphers[bike_id]
         
-        # Get bicycle's encryption key
-        key = self.database[bike_id]
-        self._create_cipher_instance(key)
+        # A token that already authenticated within the TTL is accepted
+        # without repeating the AEAD tag check
+        nonce = token.nonce
+        ciphertext = token.ciphertext
+        cache_key = (bike_id, nonce, hashlib.blake2b(ciphertext, digest_size=16).digest())
+        now = time.monotonic_ns()
+        if self._cache_lookup(cache_key, now):
+            return True
         
-        # Associated data must match encryption
-        associated_data = self.lock_manufacturer_id + bike_id.encode()
-        
-        # Decrypt and verify
-        plaintext = self.cipher.decrypt_command(
-            token["nonce"],
-            associated_data,
-            token["ciphertext"]
-        )
+        # Decrypt and verify (associated data must match encryption)
+        plaintext = cipher.decrypt_command(nonce, record.aad, ciphertext)
         
         if plaintext is None:
             return False
         
-        # Verify unlock command format
-        try:
-            command = plaintext.decode()
-            return command.startswith(f"UNLOCK:{bike_id}:")
-        except UnicodeDecodeError:
-            return False
+        # Verify unlock command format: tag, timestamp, this bike's ID
+        valid = (plaintext[:8] == UNLOCK_TAG
+                 and plaintext[UNLOCK_HEADER.size:] == record.bike_id_bytes)
+        if valid:
+            self._cache_store(cache_key, now)
+        return valid
+    
+    def _cache_lookup(self, key: Tuple[str, bytes, bytes], now: int) -> bool:
+        """Return True if key was verified and has not expired"""
+        with self._verified_lock:
+            expiry = self._verified.get(key)
+            if expiry is None:
+                return False
+            if expiry < now:
+                del self._verified[key]
+                return False
+            self._verified.move_to_end(key)
+            return True
+    
+    def _cache_store(self, key: Tuple[str, bytes, bytes], now: int):
+        """Remember a successful verification, evicting the oldest entry"""
+        with self._verified_lock:
+            self._verified[key] = now + self.VERIFY_CACHE_TTL_NS
+            self._verified.move_to_end(key)
+            if len(self._verified) > self.VERIFY_CACHE_SIZE:
+                self._verified.popitem(last=False)
+    
+    def verify_tokens_parallel(
+        self,
+        tokens: List[UnlockToken],
+        max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Verify a batch of unlock tokens across a thread pool
+        
+        The compiled cipher cores release the GIL during each AEAD pass,
+        so chunks of tokens are verified concurrently on separate cores.
+        
+        Args:
+            tokens: UnlockTokens from generate_unlock_token()
+            max_workers: Number of threads (default: os.cpu_count())
+            
+        Returns:
+            Verification result for each token, in input order
+        """
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(tokens)))
+        if workers == 1:
+            return [self.verify_unlock_token(token) for token in tokens]
+        
+        # One contiguous chunk per thread keeps executor overhead per batch
+        # rather than per token
+        size = -(-len(tokens) // workers)
+        chunks = [tokens[i:i + size] for i in range(0, len(tokens), size)]
+        verify = self.verify_unlock_token
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda chunk: [verify(t) for t in chunk], chunks)
+            return [ok for chunk_results in results for ok in chunk_results]
 
 
 def print_header():
@@ -179,6 +314,10 @@ def print_algorithm_info(system: BicycleLockSystem):
     algo = system.algorithm
     print(f"\n🔧 Current Algorithm: {algo}")
     
+    if system.auto_selected:
+        reason = "AES-NI detected" if algo == "AES" else "no AES-NI detected"
+        print(f"   (auto-selected: {reason})")
+    
     if algo == "ASCON":
         print("   ✓ NIST Lightweight Cryptography Winner")
         print("   ✓ Optimized for IoT/Constrained Devices")
@@ -221,9 +360,9 @@ def generate_token_flow(system: BicycleLockSystem):
         return
     
     print(f"\n✅ Unlock token generated successfully!")
-    print(f"   Algorithm: {token['algorithm'].decode()}")
-    print(f"   Nonce: {token['nonce'].hex()[:32]}... ({len(token['nonce'])} bytes)")
-    print(f"   Ciphertext: {token['ciphertext'].hex()[:32]}... ({len(token['ciphertext'])} bytes)")
+    print(f"   Algorithm: {token.algorithm.decode()}")
+    print(f"   Nonce: {token.nonce.hex()[:32]}... ({len(token.nonce)} bytes)")
+    print(f"   Ciphertext: {token.ciphertext.hex()[:32]}... ({len(token.ciphertext)} bytes)")
     
     # Store token for verification demo
     system._last_token = token
@@ -240,7 +379,7 @@ def verify_token_flow(system: BicycleLockSystem):
         return
     
     token = system._last_token
-    bike_id = token["bike_id"].decode()
+    bike_id = token.bike_id.decode()
     
     print(f"Attempting to unlock bicycle: {bike_id}")
     print("Verifying authentication tag...")
@@ -258,8 +397,7 @@ def verify_token_flow(system: BicycleLockSystem):
     
     # Demo: Tampered token
     print("\n🧪 TESTING: Simulating tampered token...")
-    tampered_token = token.copy()
-    tampered_token["ciphertext"] = os.urandom(len(token["ciphertext"]))
+    tampered_token = token._replace(ciphertext=os.urandom(len(token.ciphertext)))
     
     if system.verify_unlock_token(tampered_token):
         print("   ❌ SECURITY FAILURE: Tampered token accepted!")
@@ -310,8 +448,8 @@ def main():
     """Main application loop"""
     print_header()
     
-    # Default to ASCON (lightweight cryptography)
-    system = BicycleLockSystem("ASCON")
+    # Default to the fastest algorithm for this CPU
+    system = BicycleLockSystem()
     print_algorithm_info(system)
     
     while True:
@@ -0,0 +1,348 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+AES-NI + PCLMULQDQ AES-128-GCM core for AESLock
+
+CTR encryption, GHASH and tag generation run in a single C routine:
+counter blocks go through _mm_aesenc_si128 chains (four lanes at a
+time) and GHASH uses carry-less multiplication with Karatsuba and the
+shift-based reduction from Intel's GCM white paper. The 11 round keys
+and the hash subkey H are expanded once per AesGcm128 instance. The GIL
+is released around each GCM pass.
+
+Optional: build in place with
+    cythonize -i src/crypto_engine/_aesni.pyx
+The instructions are only used when the CPU reports AES-NI, PCLMUL and
+SSE4.1 support (AESNI_AVAILABLE); AESLock falls back to PyCryptodome
+otherwise.
+"""
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+
+cdef extern from *:
+    """
+    #include <stddef.h>
+    #include <stdint.h>
+    #include <string.h>
+
+    typedef struct {
+        unsigned char rk[11][16];  /* AES-128 round keys */
+        unsigned char H[16];       /* GHASH subkey, byte-reflected */
+    } aesni_gcm_ctx;
+
+    #if (defined(__x86_64__) || defined(__i386__)) && defined(__GNUC__)
+    #include <immintrin.h>
+
+    #define AESNI_TARGET __attribute__((target("aes,pclmul,sse4.1,ssse3")))
+
+    static int aesni_gcm_available(void)
+    {
+        __builtin_cpu_init();
+        return __builtin_cpu_supports("aes") && __builtin_cpu_supports("pclmul")
+            && __builtin_cpu_supports("sse4.1");
+    }
+
+    AESNI_TARGET static inline __m128i aesni_bswap(__m128i x)
+    {
+        const __m128i mask = _mm_set_epi8(0, 1, 2, 3, 4, 5, 6, 7,
+                                          8, 9, 10, 11, 12, 13, 14, 15);
+        return _mm_shuffle_epi8(x, mask);
+    }
+
+    AESNI_TARGET static inline __m128i aesni_expand(__m128i key, __m128i kg)
+    {
+        kg = _mm_shuffle_epi32(kg, 0xff);
+        key = _mm_xor_si128(key, _mm_slli_si128(key, 4));
+        key = _mm_xor_si128(key, _mm_slli_si128(key, 4));
+        key = _mm_xor_si128(key, _mm_slli_si128(key, 4));
+        return _mm_xor_si128(key, kg);
+    }
+
+    AESNI_TARGET static inline __m128i aesni_encrypt_block(const __m128i *rk, __m128i x)
+    {
+        int i;
+        x = _mm_xor_si128(x, rk[0]);
+        for (i = 1; i < 10; i++)
+            x = _mm_aesenc_si128(x, rk[i]);
+        return _mm_aesenclast_si128(x, rk[10]);
+    }
+
+    /* GF(2^128) multiply of byte-reflected operands (Karatsuba + reduction) */
+    AESNI_TARGET static inline __m128i aesni_gfmul(__m128i a, __m128i b)
+    {
+        __m128i lo, hi, mid, t7, t8, t9, t2, t4, t5;
+
+        lo = _mm_clmulepi64_si128(a, b, 0x00);
+        hi = _mm_clmulepi64_si128(a, b, 0x11);
+        mid = _mm_clmulepi64_si128(_mm_xor_si128(_mm_shuffle_epi32(a, 78), a),
+                                   _mm_xor_si128(_mm_shuffle_epi32(b, 78), b), 0x00);
+        mid = _mm_xor_si128(mid, _mm_xor_si128(lo, hi));
+        lo = _mm_xor_si128(lo, _mm_slli_si128(mid, 8));
+        hi = _mm_xor_si128(hi, _mm_srli_si128(mid, 8));
+
+        /* Shift the 256-bit product left by one (bit-reflected domain) */
+        t7 = _mm_srli_epi32(lo, 31);
+        t8 = _mm_srli_epi32(hi, 31);
+        lo = _mm_slli_epi32(lo, 1);
+        hi = _mm_slli_epi32(hi, 1);
+        t9 = _mm_srli_si128(t7, 12);
+        t8 = _mm_slli_si128(t8, 4);
+        t7 = _mm_slli_si128(t7, 4);
+        lo = _mm_or_si128(lo, t7);
+        hi = _mm_or_si128(hi, _mm_or_si128(t8, t9));
+
+        /* Reduce modulo x^128 + x^7 + x^2 + x + 1 */
+        t7 = _mm_xor_si128(_mm_xor_si128(_mm_slli_epi32(lo, 31),
+                                         _mm_slli_epi32(lo, 30)),
+                           _mm_slli_epi32(lo, 25));
+        t8 = _mm_srli_si128(t7, 4);
+        lo = _mm_xor_si128(lo, _mm_slli_si128(t7, 12));
+        t2 = _mm_srli_epi32(lo, 1);
+        t4 = _mm_srli_epi32(lo, 2);
+        t5 = _mm_srli_epi32(lo, 7);
+        t2 = _mm_xor_si128(_mm_xor_si128(t2, t4), _mm_xor_si128(t5, t8));
+        lo = _mm_xor_si128(lo, t2);
+        return _mm_xor_si128(hi, lo);
+    }
+
+    AESNI_TARGET static inline __m128i aesni_load_partial(const unsigned char *p, size_t n)
+    {
+        unsigned char block[16] = {0};
+        memcpy(block, p, n);
+        return _mm_loadu_si128((const __m128i *)block);
+    }
+
+    AESNI_TARGET static __m128i aesni_ghash_blocks(__m128i X, __m128i H,
+                                                   const unsigned char *p, size_t len)
+    {
+        for (; len >= 16; p += 16, len -= 16)
+            X = aesni_gfmul(_mm_xor_si128(X, aesni_bswap(
+                    _mm_loadu_si128((const __m128i *)p))), H);
+        if (len)
+            X = aesni_gfmul(_mm_xor_si128(X, aesni_bswap(aesni_load_partial(p, len))), H);
+        return X;
+    }
+
+    AESNI_TARGET static void aesni_gcm_init(aesni_gcm_ctx *ctx, const unsigned char *key)
+    {
+        __m128i rk[11];
+        int i;
+
+        rk[0] = _mm_loadu_si128((const __m128i *)key);
+        rk[1] = aesni_expand(rk[0], _mm_aeskeygenassist_si128(rk[0], 0x01));
+        rk[2] = aesni_expand(rk[1], _mm_aeskeygenassist_si128(rk[1], 0x02));
+        rk[3] = aesni_expand(rk[2], _mm_aeskeygenassist_si128(rk[2], 0x04));
+        rk[4] = aesni_expand(rk[3], _mm_aeskeygenassist_si128(rk[3], 0x08));
+        rk[5] = aesni_expand(rk[4], _mm_aeskeygenassist_si128(rk[4], 0x10));
+        rk[6] = aesni_expand(rk[5], _mm_aeskeygenassist_si128(rk[5], 0x20));
+        rk[7] = aesni_expand(rk[6], _mm_aeskeygenassist_si128(rk[6], 0x40));
+        rk[8] = aesni_expand(rk[7], _mm_aeskeygenassist_si128(rk[7], 0x80));
+        rk[9] = aesni_expand(rk[8], _mm_aeskeygenassist_si128(rk[8], 0x1b));
+        rk[10] = aesni_expand(rk[9], _mm_aeskeygenassist_si128(rk[9], 0x36));
+        for (i = 0; i < 11; i++)
+            _mm_storeu_si128((__m128i *)ctx->rk[i], rk[i]);
+
+        /* H = E_K(0^128), kept byte-reflected for aesni_gfmul */
+        _mm_storeu_si128((__m128i *)ctx->H,
+                         aesni_bswap(aesni_encrypt_block(rk, _mm_setzero_si128())));
+    }
+
+    /* One GCM pass with a 96-bit nonce: writes len bytes to out, 16 to tag */
+    AESNI_TARGET static void aesni_gcm_crypt(const aesni_gcm_ctx *ctx,
+                                             const unsigned char *nonce,
+                                             const unsigned char *aad, size_t aadlen,
+                                             const unsigned char *in, size_t len,
+                                             unsigned char *out, unsigned char *tag,
+                                             int decrypting)
+    {
+        __m128i rk[11], H, X, J0, b0, b1, b2, b3;
+        const unsigned char *ct = decrypting ? in : out;
+        const unsigned char *ct_start = ct;
+        unsigned char block[16];
+        uint32_t ctr = 2;
+        size_t total = len;
+        int i;
+
+        for (i = 0; i < 11; i++)
+            rk[i] = _mm_loadu_si128((const __m128i *)ctx->rk[i]);
+        H = _mm_loadu_si128((const __m128i *)ctx->H);
+
+        /* J0 = nonce || 0^31 || 1 */
+        memcpy(block, nonce, 12);
+        block[12] = 0; block[13] = 0; block[14] = 0; block[15] = 1;
+        J0 = _mm_loadu_si128((const __m128i *)block);
+
+        X = aesni_ghash_blocks(_mm_setzero_si128(), H, aad, aadlen);
+
+    #define AESNI_CTR_BLOCK(c) _mm_insert_epi32(J0, (int)__builtin_bswap32(c), 3)
+
+        /* Four independent counter lanes keep the AES units busy */
+        for (; len >= 64; in += 64, out += 64, len -= 64, ctr += 4) {
+            b0 = _mm_xor_si128(AESNI_CTR_BLOCK(ctr), rk[0]);
+            b1 = _mm_xor_si128(AESNI_CTR_BLOCK(ctr + 1), rk[0]);
+            b2 = _mm_xor_si128(AESNI_CTR_BLOCK(ctr + 2), rk[0]);
+            b3 = _mm_xor_si128(AESNI_CTR_BLOCK(ctr + 3), rk[0]);
+            for (i = 1; i < 10; i++) {
+                b0 = _mm_aesenc_si128(b0, rk[i]);
+                b1 = _mm_aesenc_si128(b1, rk[i]);
+                b2 = _mm_aesenc_si128(b2, rk[i]);
+                b3 = _mm_aesenc_si128(b3, rk[i]);
+            }
+            b0 = _mm_aesenclast_si128(b0, rk[10]);
+            b1 = _mm_aesenclast_si128(b1, rk[10]);
+            b2 = _mm_aesenclast_si128(b2, rk[10]);
+            b3 = _mm_aesenclast_si128(b3, rk[10]);
+            _mm_storeu_si128((__m128i *)out, _mm_xor_si128(b0,
+                             _mm_loadu_si128((const __m128i *)in)));
+            _mm_storeu_si128((__m128i *)(out + 16), _mm_xor_si128(b1,
+                             _mm_loadu_si128((const __m128i *)(in + 16))));
+            _mm_storeu_si128((__m128i *)(out + 32), _mm_xor_si128(b2,
+                             _mm_loadu_si128((const __m128i *)(in + 32))));
+            _mm_storeu_si128((__m128i *)(out + 48), _mm_xor_si128(b3,
+                             _mm_loadu_si128((const __m128i *)(in + 48))));
+        }
+        for (; len >= 16; in += 16, out += 16, len -= 16, ctr++) {
+            b0 = aesni_encrypt_block(rk, AESNI_CTR_BLOCK(ctr));
+            _mm_storeu_si128((__m128i *)out, _mm_xor_si128(b0,
+                             _mm_loadu_si128((const __m128i *)in)));
+        }
+        if (len) {
+            b0 = aesni_encrypt_block(rk, AESNI_CTR_BLOCK(ctr));
+            _mm_storeu_si128((__m128i *)block, b0);
+            for (i = 0; i < (int)len; i++)
+                out[i] = in[i] ^ block[i];
+        }
+    #undef AESNI_CTR_BLOCK
+
+        /* GHASH over the ciphertext, then the bit-length block */
+        X = aesni_ghash_blocks(X, H, ct_start, total);
+        X = aesni_gfmul(_mm_xor_si128(X, _mm_set_epi64x((long long)aadlen * 8,
+                                                        (long long)total * 8)), H);
+
+        /* tag = E_K(J0) ^ GHASH */
+        _mm_storeu_si128((__m128i *)tag, _mm_xor_si128(aesni_bswap(X),
+                         aesni_encrypt_block(rk, J0)));
+    }
+
+    #else  /* non-x86 or non-GCC toolchain: never selected at runtime */
+
+    static int aesni_gcm_available(void) { return 0; }
+    static void aesni_gcm_init(aesni_gcm_ctx *ctx, const unsigned char *key)
+    { (void)ctx; (void)key; }
+    static void aesni_gcm_crypt(const aesni_gcm_ctx *ctx, const unsigned char *nonce,
+                                const unsigned char *aad, size_t aadlen,
+                                const unsigned char *in, size_t len,
+                                unsigned char *out, unsigned char *tag, int decrypting)
+    { (void)ctx; (void)nonce; (void)aad; (void)aadlen; (void)in; (void)len;
+      (void)out; (void)tag; (void)decrypting; }
+
+    #endif
+    """
+    ctypedef struct aesni_gcm_ctx:
+        unsigned char H[16]
+
+    int aesni_gcm_available() nogil
+    void aesni_gcm_init(aesni_gcm_ctx* ctx, const unsigned char* key) nogil
+    void aesni_gcm_crypt(const aesni_gcm_ctx* ctx, const unsigned char* nonce,
+                         const unsigned char* aad, size_t aadlen,
+                         const unsigned char* inp, size_t inlen,
+                         unsigned char* out, unsigned char* tag,
+                         int decrypting) nogil
+
+
+cdef enum:
+    NONCE_LEN = 12
+    TAG_LEN = 16
+
+
+AESNI_AVAILABLE = bool(aesni_gcm_available())
+
+
+cdef class AesGcm128:
+    """
+    AES-128-GCM with a precomputed key schedule and GHASH subkey
+
+    Only 96-bit nonces are supported (the GCM fast path, J0 = nonce || 1).
+    """
+    cdef aesni_gcm_ctx ctx
+
+    def __cinit__(self, key):
+        if not AESNI_AVAILABLE:
+            raise RuntimeError("CPU does not support AES-NI/PCLMULQDQ")
+        cdef bytes k = bytes(key)
+        if len(k) != 16:
+            raise ValueError("AES-128 requires 16-byte (128-bit) key")
+        aesni_gcm_init(&self.ctx, k)
+
+    cdef bytes _seal(self, bytes n, bytes a, bytes p):
+        if len(n) != NONCE_LEN:
+            raise ValueError("AES-GCM core requires a 12-byte nonce")
+
+        cdef Py_ssize_t plen = len(p), alen = len(a)
+        cdef const unsigned char* np_ = n
+        cdef const unsigned char* ap = a
+        cdef const unsigned char* pp = p
+        cdef bytes result = PyBytes_FromStringAndSize(NULL, plen + TAG_LEN)
+        cdef unsigned char* out = <unsigned char*>PyBytes_AS_STRING(result)
+        # Inputs are immutable bytes kept alive by this frame
+        with nogil:
+            aesni_gcm_crypt(&self.ctx, np_, ap, alen, pp, plen, out, out + plen, 0)
+        return result
+
+    cdef object _open(self, bytes n, bytes a, bytes c):
+        if len(n) != NONCE_LEN:
+            raise ValueError("AES-GCM core requires a 12-byte nonce")
+
+        cdef Py_ssize_t clen = len(c) - TAG_LEN
+        if clen < 0:
+            raise ValueError("Ciphertext shorter than the 16-byte tag")
+
+        cdef Py_ssize_t alen = len(a)
+        cdef const unsigned char* np_ = n
+        cdef const unsigned char* ap = a
+        cdef const unsigned char* received = c
+        cdef bytes plaintext = PyBytes_FromStringAndSize(NULL, clen)
+        cdef unsigned char* out = <unsigned char*>PyBytes_AS_STRING(plaintext)
+        cdef unsigned char tag[TAG_LEN]
+        cdef unsigned char diff = 0
+        cdef int i
+        with nogil:
+            aesni_gcm_crypt(&self.ctx, np_, ap, alen, received, clen, out, tag, 1)
+
+        # Constant-time tag comparison
+        for i in range(TAG_LEN):
+            diff |= tag[i] ^ received[clen + i]
+        if diff != 0:
+            return None
+        return plaintext
+
+    def seal(self, nonce, associated_data, plaintext):
+        """
+        Encrypt and authenticate
+
+        Returns:
+            Ciphertext concatenated with the 16-byte tag
+        """
+        return self._seal(bytes(nonce), bytes(associated_data), bytes(plaintext))
+
+    def open(self, nonce, associated_data, ciphertext_tag):
+        """
+        Verify and decrypt
+
+        Returns:
+            Plaintext, or None if the tag does not verify
+        """
+        return self._open(bytes(nonce), bytes(associated_data), bytes(ciphertext_tag))
+
+    def seal_batch(self, nonces, associated_data, plaintexts):
+        """Encrypt many messages sharing associated data; returns ct+tag list"""
+        cdef bytes a = bytes(associated_data)
+        return [self._seal(bytes(n), a, bytes(p)) for n, p in zip(nonces, plaintexts)]
+
+    def open_batch(self, nonces, associated_data, ciphertexts):
+        """Decrypt many messages sharing associated data; None marks a bad tag"""
+        cdef bytes a = bytes(associated_data)
+        return [self._open(bytes(n), a, bytes(c)) for n, c in zip(nonces, ciphertexts)]
+
+
+def aes_gcm_seal(key, nonce, associated_data, plaintext):
+    """One-shot AES-128-GCM encryption; returns ciphertext + tag"""
+    return AesGcm128(key).seal(nonce, associated_data, plaintext)
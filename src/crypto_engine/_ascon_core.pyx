@@ -0,0 +1,283 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled ASCON-128 core for AsconLock
+
+Drop-in replacement for ascon.encrypt / ascon.decrypt (Ascon v1.2,
+"Ascon-128" variant only). The 320-bit state is kept in five uint64_t
+locals and the permutation runs entirely in native code, instead of the
+per-round Python integer arithmetic of the reference package. The GIL
+is released around each AEAD pass so threads can run them concurrently.
+
+Optional: build in place with
+    cythonize -i src/crypto_engine/_ascon_core.pyx
+AsconLock falls back to the pure-Python _ascon_swar module when the
+compiled module is not available.
+"""
+from libc.stdint cimport uint64_t
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+
+# Ascon-128: k=128 bits, rate=64 bits, a=12 rounds, b=6 rounds
+cdef enum:
+    ROUNDS_A = 12
+    ROUNDS_B = 6
+    RATE = 8
+    TAG_LEN = 16
+
+cdef uint64_t IV_ASCON128 = 0x80400c0600000000ULL
+
+
+cdef inline uint64_t _ror(uint64_t x, int n) noexcept nogil:
+    return (x >> n) | (x << (64 - n))
+
+
+cdef inline uint64_t _load64(const unsigned char* p) noexcept nogil:
+    """Big-endian load of a full 8-byte block"""
+    return ((<uint64_t>p[0] << 56) | (<uint64_t>p[1] << 48) |
+            (<uint64_t>p[2] << 40) | (<uint64_t>p[3] << 32) |
+            (<uint64_t>p[4] << 24) | (<uint64_t>p[5] << 16) |
+            (<uint64_t>p[6] << 8) | <uint64_t>p[7])
+
+
+cdef inline void _store64(unsigned char* p, uint64_t x) noexcept nogil:
+    """Big-endian store of a full 8-byte block"""
+    cdef int i
+    for i in range(8):
+        p[i] = <unsigned char>(x >> (56 - 8 * i))
+
+
+cdef inline uint64_t _load_partial(const unsigned char* p, Py_ssize_t n) noexcept nogil:
+    """Load n < 8 bytes into the most significant bytes of a word"""
+    cdef uint64_t x = 0
+    cdef Py_ssize_t i
+    for i in range(n):
+        x |= <uint64_t>p[i] << (56 - 8 * i)
+    return x
+
+
+cdef inline void _store_partial(unsigned char* p, uint64_t x, Py_ssize_t n) noexcept nogil:
+    """Store the n < 8 most significant bytes of a word"""
+    cdef Py_ssize_t i
+    for i in range(n):
+        p[i] = <unsigned char>(x >> (56 - 8 * i))
+
+
+cdef inline uint64_t _pad(Py_ssize_t n) noexcept nogil:
+    """10* padding bit for a final block holding n < 8 bytes"""
+    return <uint64_t>0x80 << (56 - 8 * n)
+
+
+cdef void ascon_permutation(uint64_t* s, int rounds) noexcept nogil:
+    """
+    ASCON permutation p^rounds on a 5-word state
+
+    Constant addition, the bitsliced 5-bit S-box and the linear layer
+    are fused into one routine operating on register-resident words.
+    """
+    cdef uint64_t x0 = s[0], x1 = s[1], x2 = s[2], x3 = s[3], x4 = s[4]
+    cdef uint64_t t0, t1, t2, t3, t4
+    cdef int r
+    for r in range(12 - rounds, 12):
+        # Round constant
+        x2 ^= <uint64_t>(((0xf - r) << 4) | r)
+        # Substitution layer
+        x0 ^= x4
+        x4 ^= x3
+        x2 ^= x1
+        t0 = ~x0 & x1
+        t1 = ~x1 & x2
+        t2 = ~x2 & x3
+        t3 = ~x3 & x4
+        t4 = ~x4 & x0
+        x0 ^= t1
+        x1 ^= t2
+        x2 ^= t3
+        x3 ^= t4
+        x4 ^= t0
+        x1 ^= x0
+        x0 ^= x4
+        x3 ^= x2
+        x2 = ~x2
+        # Linear diffusion layer
+        x0 ^= _ror(x0, 19) ^ _ror(x0, 28)
+        x1 ^= _ror(x1, 61) ^ _ror(x1, 39)
+        x2 ^= _ror(x2, 1) ^ _ror(x2, 6)
+        x3 ^= _ror(x3, 10) ^ _ror(x3, 17)
+        x4 ^= _ror(x4, 7) ^ _ror(x4, 41)
+    s[0] = x0
+    s[1] = x1
+    s[2] = x2
+    s[3] = x3
+    s[4] = x4
+
+
+cdef void _ascon128_crypt(
+    const unsigned char* key,
+    const unsigned char* nonce,
+    const unsigned char* ad, Py_ssize_t adlen,
+    const unsigned char* inp, Py_ssize_t inlen,
+    unsigned char* out,
+    unsigned char* tag,
+    bint decrypting
+) noexcept nogil:
+    """Ascon-128 AEAD pass: writes inlen bytes to out and the tag to tag"""
+    cdef uint64_t s[5]
+    cdef uint64_t k0 = _load64(key), k1 = _load64(key + 8)
+    cdef uint64_t c
+    cdef Py_ssize_t n
+
+    # Initialization
+    s[0] = IV_ASCON128
+    s[1] = k0
+    s[2] = k1
+    s[3] = _load64(nonce)
+    s[4] = _load64(nonce + 8)
+    ascon_permutation(s, ROUNDS_A)
+    s[3] ^= k0
+    s[4] ^= k1
+
+    # Associated data
+    if adlen > 0:
+        while adlen >= RATE:
+            s[0] ^= _load64(ad)
+            ascon_permutation(s, ROUNDS_B)
+            ad += RATE
+            adlen -= RATE
+        s[0] ^= _load_partial(ad, adlen) ^ _pad(adlen)
+        ascon_permutation(s, ROUNDS_B)
+    s[4] ^= 1
+
+    # Plaintext / ciphertext
+    n = inlen
+    if not decrypting:
+        while n >= RATE:
+            s[0] ^= _load64(inp)
+            _store64(out, s[0])
+            ascon_permutation(s, ROUNDS_B)
+            inp += RATE
+            out += RATE
+            n -= RATE
+        s[0] ^= _load_partial(inp, n) ^ _pad(n)
+        _store_partial(out, s[0], n)
+    else:
+        while n >= RATE:
+            c = _load64(inp)
+            _store64(out, s[0] ^ c)
+            s[0] = c
+            ascon_permutation(s, ROUNDS_B)
+            inp += RATE
+            out += RATE
+            n -= RATE
+        c = _load_partial(inp, n)
+        _store_partial(out, s[0] ^ c, n)
+        # Keep the unused low bytes of the rate word, replace the rest
+        s[0] = c ^ (s[0] & (<uint64_t>0xFFFFFFFFFFFFFFFF >> (8 * n))) ^ _pad(n)
+
+    # Finalization
+    s[1] ^= k0
+    s[2] ^= k1
+    ascon_permutation(s, ROUNDS_A)
+    s[3] ^= k0
+    s[4] ^= k1
+    _store64(tag, s[3])
+    _store64(tag + 8, s[4])
+
+
+cdef inline void _check_params(bytes key, str variant) except *:
+    if variant != "Ascon-128":
+        raise ValueError(f"Unsupported variant for compiled core: {variant}")
+    if len(key) != 16:
+        raise ValueError("Ascon-128 requires a 16-byte key")
+
+
+cdef bytes _seal(bytes k, bytes n, bytes a, bytes p):
+    """Encrypt one message; returns ciphertext + tag"""
+    if len(n) != 16:
+        raise ValueError("Ascon-128 requires a 16-byte nonce")
+    cdef Py_ssize_t plen = len(p), alen = len(a)
+    cdef const unsigned char* kp = k
+    cdef const unsigned char* np_ = n
+    cdef const unsigned char* ap = a
+    cdef const unsigned char* pp = p
+    cdef bytes result = PyBytes_FromStringAndSize(NULL, plen + TAG_LEN)
+    cdef unsigned char* out = <unsigned char*>PyBytes_AS_STRING(result)
+    # Inputs are immutable bytes kept alive by this frame
+    with nogil:
+        _ascon128_crypt(kp, np_, ap, alen, pp, plen, out, out + plen, False)
+    return result
+
+
+cdef object _open(bytes k, bytes n, bytes a, bytes c):
+    """Decrypt one message; returns plaintext or None on tag mismatch"""
+    if len(n) != 16:
+        raise ValueError("Ascon-128 requires a 16-byte nonce")
+    cdef Py_ssize_t clen = len(c) - TAG_LEN
+    if clen < 0:
+        raise ValueError("Ciphertext shorter than the 16-byte tag")
+
+    cdef Py_ssize_t alen = len(a)
+    cdef const unsigned char* kp = k
+    cdef const unsigned char* np_ = n
+    cdef const unsigned char* ap = a
+    cdef const unsigned char* received = c
+    cdef bytes plaintext = PyBytes_FromStringAndSize(NULL, clen)
+    cdef unsigned char* out = <unsigned char*>PyBytes_AS_STRING(plaintext)
+    cdef unsigned char tag[TAG_LEN]
+    cdef unsigned char diff = 0
+    cdef int i
+    with nogil:
+        _ascon128_crypt(kp, np_, ap, alen, received, clen, out, tag, True)
+
+    # Constant-time tag comparison
+    for i in range(TAG_LEN):
+        diff |= tag[i] ^ received[clen + i]
+    if diff != 0:
+        return None
+    return plaintext
+
+
+def encrypt(key, nonce, associateddata, plaintext, variant="Ascon-128"):
+    """
+    Ascon-128 encryption (same signature as ascon.encrypt)
+
+    Returns:
+        Ciphertext concatenated with the 16-byte tag
+    """
+    cdef bytes k = bytes(key)
+    _check_params(k, variant)
+    return _seal(k, bytes(nonce), bytes(associateddata), bytes(plaintext))
+
+
+def decrypt(key, nonce, associateddata, ciphertext, variant="Ascon-128"):
+    """
+    Ascon-128 decryption (same signature as ascon.decrypt)
+
+    Returns:
+        Plaintext, or None if the tag does not verify
+    """
+    cdef bytes k = bytes(key)
+    _check_params(k, variant)
+    return _open(k, bytes(nonce), bytes(associateddata), bytes(ciphertext))
+
+
+def encrypt_batch(key, nonces, associateddata, plaintexts):
+    """
+    Ascon-128 encryption of many messages under one key and associated data
+
+    Returns:
+        List of ciphertext+tag, in input order
+    """
+    cdef bytes k = bytes(key), a = bytes(associateddata)
+    _check_params(k, "Ascon-128")
+    return [_seal(k, bytes(n), a, bytes(p)) for n, p in zip(nonces, plaintexts)]
+
+
+def decrypt_batch(key, nonces, associateddata, ciphertexts):
+    """
+    Ascon-128 decryption of many messages under one key and associated data
+
+    Returns:
+        List of plaintexts (None where the tag does not verify), in input order
+    """
+    cdef bytes k = bytes(key), a = bytes(associateddata)
+    _check_params(k, "Ascon-128")
+    return [_open(k, bytes(n), a, bytes(c)) for n, c in zip(nonces, ciphertexts)]
@@ -0,0 +1,165 @@
+"""
+Numba-compiled Ascon-128 for deployments without a C toolchain
+
+Same fused permutation as _ascon_swar, but every word is a numpy.uint64
+so LLVM keeps the state in 64-bit registers. The whole AEAD pass runs
+in one jitted call over uint8 views of the inputs. Importing this
+module raises ImportError when numba is not installed.
+"""
+import hmac
+
+import numpy as np
+from numba import njit
+
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+_IV_ASCON128 = np.uint64(0x80400C0600000000)
+_ROUNDS_A = 12
+_ROUNDS_B = 6
+_RATE = 8
+_TAG_LEN = 16
+
+
+@njit(cache=True, boundscheck=False)
+def _ror(x, n):
+    return (x >> np.uint64(n)) | (x << np.uint64(64 - n))
+
+
+@njit(cache=True, boundscheck=False)
+def permute(x0, x1, x2, x3, x4, rounds):
+    """ASCON permutation p^rounds on five numpy.uint64 words"""
+    for r in range(12 - rounds, 12):
+        # Round constant
+        x2 ^= np.uint64(((0xF - r) << 4) | r)
+        # Substitution layer
+        x0 ^= x4
+        x4 ^= x3
+        x2 ^= x1
+        t0 = ~x0 & x1
+        t1 = ~x1 & x2
+        t2 = ~x2 & x3
+        t3 = ~x3 & x4
+        t4 = ~x4 & x0
+        x0 ^= t1
+        x1 ^= t2
+        x2 ^= t3
+        x3 ^= t4
+        x4 ^= t0
+        x1 ^= x0
+        x0 ^= x4
+        x3 ^= x2
+        x2 = ~x2
+        # Linear diffusion layer
+        x0 ^= _ror(x0, 19) ^ _ror(x0, 28)
+        x1 ^= _ror(x1, 61) ^ _ror(x1, 39)
+        x2 ^= _ror(x2, 1) ^ _ror(x2, 6)
+        x3 ^= _ror(x3, 10) ^ _ror(x3, 17)
+        x4 ^= _ror(x4, 7) ^ _ror(x4, 41)
+    return x0, x1, x2, x3, x4
+
+
+@njit(cache=True, boundscheck=False)
+def _load(buf, offset, n):
+    """Big-endian load of n <= 8 bytes into the high bytes of a word"""
+    x = np.uint64(0)
+    for i in range(n):
+        x |= np.uint64(buf[offset + i]) << np.uint64(56 - 8 * i)
+    return x
+
+
+@njit(cache=True, boundscheck=False)
+def _store(buf, offset, x, n):
+    """Store the n <= 8 high bytes of a word"""
+    for i in range(n):
+        buf[offset + i] = np.uint8((x >> np.uint64(56 - 8 * i)) & np.uint64(0xFF))
+
+
+@njit(cache=True, boundscheck=False)
+def _pad(n):
+    """10* padding bit for a final block holding n < 8 bytes"""
+    return np.uint64(0x80) << np.uint64(56 - 8 * n)
+
+
+@njit(cache=True, boundscheck=False)
+def _crypt(key, nonce, ad, data, out, decrypting):
+    """Ascon-128 AEAD pass: len(data) bytes then the 16-byte tag into out"""
+    k0 = _load(key, 0, 8)
+    k1 = _load(key, 8, 8)
+
+    # Initialization
+    x0, x1, x2, x3, x4 = permute(_IV_ASCON128, k0, k1,
+                                 _load(nonce, 0, 8), _load(nonce, 8, 8), _ROUNDS_A)
+    x3 ^= k0
+    x4 ^= k1
+
+    # Associated data
+    adlen = ad.size
+    if adlen > 0:
+        offset = 0
+        while adlen - offset >= _RATE:
+            x0 ^= _load(ad, offset, _RATE)
+            x0, x1, x2, x3, x4 = permute(x0, x1, x2, x3, x4, _ROUNDS_B)
+            offset += _RATE
+        remainder = adlen - offset
+        x0 ^= _load(ad, offset, remainder) ^ _pad(remainder)
+        x0, x1, x2, x3, x4 = permute(x0, x1, x2, x3, x4, _ROUNDS_B)
+    x4 ^= np.uint64(1)
+
+    # Plaintext / ciphertext
+    length = data.size
+    offset = 0
+    while length - offset >= _RATE:
+        c = _load(data, offset, _RATE)
+        if decrypting:
+            _store(out, offset, x0 ^ c, _RATE)
+            x0 = c
+        else:
+            x0 ^= c
+            _store(out, offset, x0, _RATE)
+        x0, x1, x2, x3, x4 = permute(x0, x1, x2, x3, x4, _ROUNDS_B)
+        offset += _RATE
+    remainder = length - offset
+    c = _load(data, offset, remainder)
+    if decrypting:
+        _store(out, offset, x0 ^ c, remainder)
+        x0 = c ^ (x0 & (_MASK >> np.uint64(8 * remainder))) ^ _pad(remainder)
+    else:
+        x0 ^= c ^ _pad(remainder)
+        _store(out, offset, x0, remainder)
+
+    # Finalization
+    x0, x1, x2, x3, x4 = permute(x0, x1 ^ k0, x2 ^ k1, x3, x4, _ROUNDS_A)
+    _store(out, length, x3 ^ k0, 8)
+    _store(out, length + 8, x4 ^ k1, 8)
+
+
+def _check_params(key: bytes, nonce: bytes, variant: str) -> None:
+    if variant != "Ascon-128":
+        raise ValueError(f"Unsupported variant: {variant}")
+    if len(key) != 16 or len(nonce) != 16:
+        raise ValueError("Ascon-128 requires a 16-byte key and 16-byte nonce")
+
+
+def _u8(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def encrypt(key, nonce, associateddata, plaintext, variant="Ascon-128"):
+    """Ascon-128 encryption (same signature as ascon.encrypt); returns ct + tag"""
+    _check_params(key, nonce, variant)
+    out = np.empty(len(plaintext) + _TAG_LEN, dtype=np.uint8)
+    _crypt(_u8(key), _u8(nonce), _u8(associateddata), _u8(plaintext), out, False)
+    return out.tobytes()
+
+
+def decrypt(key, nonce, associateddata, ciphertext, variant="Ascon-128"):
+    """Ascon-128 decryption (same signature as ascon.decrypt); None on bad tag"""
+    _check_params(key, nonce, variant)
+    length = len(ciphertext) - _TAG_LEN
+    if length < 0:
+        raise ValueError("Ciphertext shorter than the 16-byte tag")
+    out = np.empty(length + _TAG_LEN, dtype=np.uint8)
+    _crypt(_u8(key), _u8(nonce), _u8(associateddata),
+           _u8(ciphertext)[:length], out, True)
+    if not hmac.compare_digest(out[length:].tobytes(), ciphertext[length:]):
+        return None
+    return out[:length].tobytes()
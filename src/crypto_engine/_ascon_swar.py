@@ -0,0 +1,145 @@
+"""
+Pure-Python Ascon-128 with a single fused 64-bit permutation
+
+The reference `ascon` package keeps the state in a list and runs each
+round as separate constant, substitution and linear-layer calls with a
+rotate helper. Here the 320-bit state lives in five int locals, the
+S-box is the bitsliced XOR/AND network and the rotations are inlined,
+so one call performs all rounds. Used by AsconLock when the compiled
+core is not built.
+"""
+import hmac
+import struct
+from typing import Optional, Tuple
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+_IV_ASCON128 = 0x80400C0600000000
+_ROUNDS_A = 12
+_ROUNDS_B = 6
+_RATE = 8
+_TAG_LEN = 16
+_ROUND_CONSTANTS = tuple(((0xF - r) << 4) | r for r in range(12))
+
+
+def permute(
+    x0: int, x1: int, x2: int, x3: int, x4: int, rounds: int
+) -> Tuple[int, int, int, int, int]:
+    """ASCON permutation p^rounds on five 64-bit words"""
+    for c in _ROUND_CONSTANTS[12 - rounds:]:
+        # Round constant
+        x2 ^= c
+        # Substitution layer
+        x0 ^= x4
+        x4 ^= x3
+        x2 ^= x1
+        t0 = ~x0 & x1
+        t1 = ~x1 & x2
+        t2 = ~x2 & x3
+        t3 = ~x3 & x4
+        t4 = ~x4 & x0
+        x0 ^= t1
+        x1 ^= t2
+        x2 ^= t3
+        x3 ^= t4
+        x4 ^= t0
+        x1 ^= x0
+        x0 ^= x4
+        x3 ^= x2
+        x2 ^= _MASK
+        # Linear diffusion layer (rotate right, masked back to 64 bits)
+        x0 = (x0 ^ (x0 >> 19 | x0 << 45) ^ (x0 >> 28 | x0 << 36)) & _MASK
+        x1 = (x1 ^ (x1 >> 61 | x1 << 3) ^ (x1 >> 39 | x1 << 25)) & _MASK
+        x2 = (x2 ^ (x2 >> 1 | x2 << 63) ^ (x2 >> 6 | x2 << 58)) & _MASK
+        x3 = (x3 ^ (x3 >> 10 | x3 << 54) ^ (x3 >> 17 | x3 << 47)) & _MASK
+        x4 = (x4 ^ (x4 >> 7 | x4 << 57) ^ (x4 >> 41 | x4 << 23)) & _MASK
+    return x0, x1, x2, x3, x4
+
+
+def _check_params(key: bytes, nonce: bytes, variant: str) -> None:
+    if variant != "Ascon-128":
+        raise ValueError(f"Unsupported variant: {variant}")
+    if len(key) != 16 or len(nonce) != 16:
+        raise ValueError("Ascon-128 requires a 16-byte key and 16-byte nonce")
+
+
+def _pad_words(data: bytes) -> Tuple[int, ...]:
+    """Apply 10* padding and split into big-endian 64-bit words"""
+    padded = data + b"\x80" + bytes(-(len(data) + 1) % _RATE)
+    return struct.unpack(f">{len(padded) // _RATE}Q", padded)
+
+
+def _initialize(key: bytes, nonce: bytes, associateddata: bytes):
+    """Initialization and associated-data phases; returns state and key words"""
+    k0, k1 = struct.unpack(">QQ", key)
+    n0, n1 = struct.unpack(">QQ", nonce)
+    x0, x1, x2, x3, x4 = permute(_IV_ASCON128, k0, k1, n0, n1, _ROUNDS_A)
+    x3 ^= k0
+    x4 ^= k1
+
+    if associateddata:
+        for word in _pad_words(associateddata):
+            x0, x1, x2, x3, x4 = permute(x0 ^ word, x1, x2, x3, x4, _ROUNDS_B)
+    x4 ^= 1
+    return (x0, x1, x2, x3, x4), k0, k1
+
+
+def _finalize(state, k0: int, k1: int) -> bytes:
+    x0, x1, x2, x3, x4 = state
+    x0, x1, x2, x3, x4 = permute(x0, x1 ^ k0, x2 ^ k1, x3, x4, _ROUNDS_A)
+    return struct.pack(">QQ", x3 ^ k0, x4 ^ k1)
+
+
+def encrypt(
+    key: bytes,
+    nonce: bytes,
+    associateddata: bytes,
+    plaintext: bytes,
+    variant: str = "Ascon-128"
+) -> bytes:
+    """Ascon-128 encryption (same signature as ascon.encrypt); returns ct + tag"""
+    _check_params(key, nonce, variant)
+    (x0, x1, x2, x3, x4), k0, k1 = _initialize(key, nonce, associateddata)
+
+    words = _pad_words(plaintext)
+    out = []
+    for word in words[:-1]:
+        x0 ^= word
+        out.append(x0)
+        x0, x1, x2, x3, x4 = permute(x0, x1, x2, x3, x4, _ROUNDS_B)
+    x0 ^= words[-1]
+    out.append(x0)
+
+    ciphertext = struct.pack(f">{len(out)}Q", *out)[:len(plaintext)]
+    return ciphertext + _finalize((x0, x1, x2, x3, x4), k0, k1)
+
+
+def decrypt(
+    key: bytes,
+    nonce: bytes,
+    associateddata: bytes,
+    ciphertext: bytes,
+    variant: str = "Ascon-128"
+) -> Optional[bytes]:
+    """Ascon-128 decryption (same signature as ascon.decrypt); None on bad tag"""
+    _check_params(key, nonce, variant)
+    if len(ciphertext) < _TAG_LEN:
+        raise ValueError("Ciphertext shorter than the 16-byte tag")
+    (x0, x1, x2, x3, x4), k0, k1 = _initialize(key, nonce, associateddata)
+
+    body = ciphertext[:-_TAG_LEN]
+    full = len(body) // _RATE
+    remainder = len(body) % _RATE
+    out = []
+    for (word,) in struct.iter_unpack(">Q", body[:full * _RATE]):
+        out.append(x0 ^ word)
+        x0, x1, x2, x3, x4 = permute(word, x1, x2, x3, x4, _ROUNDS_B)
+
+    # Final partial block: keep the state bytes beyond the ciphertext
+    last = int.from_bytes(body[full * _RATE:] + bytes(_RATE - remainder), "big")
+    out.append(x0 ^ last)
+    x0 = last ^ (x0 & (_MASK >> (8 * remainder))) ^ (0x80 << (56 - 8 * remainder))
+
+    tag = _finalize((x0, x1, x2, x3, x4), k0, k1)
+    if not hmac.compare_digest(tag, ciphertext[-_TAG_LEN:]):
+        return None
+    return struct.pack(f">{len(out)}Q", *out)[:len(body)]
@@ -11,9 +11,116 @@ Security Properties:
 - Associated data support
 """
 import os
+import hmac
+import struct
 from Crypto.Cipher import AES
-from typing import Tuple, Optional
-from .base_cipher import BaseCipher
+from Crypto.Util.strxor import strxor
+from typing import List, Tuple, Optional
+from .base_cipher import BaseCipher, _NoncePool
+
+try:
+    # AES-NI/PCLMUL core (build with: cythonize -i src/crypto_engine/_aesni.pyx)
+    from ._aesni import AesGcm128, AESNI_AVAILABLE
+except ImportError:
+    AESNI_AVAILABLE = False
+
+try:
+    # OpenSSL one-shot AES-GCM from the optional `cryptography` package
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+try:
+    # PyCryptodome's native GHASH (pinned version; private module)
+    from Crypto.Cipher._mode_gcm import _GHASH, _ghash_clmul, _ghash_portable
+    _GHASH_IMPL = _ghash_clmul or _ghash_portable
+except ImportError:
+    _GHASH = None
+
+
+def _zero_pad(data: bytes) -> bytes:
+    """Pad to a multiple of the 16-byte GHASH block"""
+    return data + bytes(-len(data) % 16)
+
+
+class _CachedGcm:
+    """
+    AES-128-GCM over a cached key schedule (NIST SP 800-38D, 96-bit nonces)
+    
+    AES.new(..., MODE_GCM) expands the key three times and derives the hash
+    subkey on every call. Here the ECB key schedule and H = E_K(0^128) are
+    computed once; each operation encrypts J0 and its counter blocks in a
+    single ECB call and runs PyCryptodome's GHASH over AAD and ciphertext.
+    """
+    
+    __slots__ = ('_ecb', '_H')
+    
+    def __init__(self, key: bytes):
+        self._ecb = AES.new(key, AES.MODE_ECB)
+        self._H = self._ecb.encrypt(b"\x00" * 16)
+    
+    def _keystream(self, nonce: bytes, length: int) -> bytes:
+        """E_K(J0) followed by the CTR keystream starting at inc32(J0)"""
+        if len(nonce) != 12:
+            raise ValueError("Cached GCM path requires a 12-byte nonce")
+        blocks = [nonce + i.to_bytes(4, 'big')
+                  for i in range(1, (length + 15) // 16 + 2)]
+        return self._ecb.encrypt(b"".join(blocks))
+    
+    def _ghash(self, associated_data: bytes, ciphertext: bytes) -> bytes:
+        ghash = _GHASH(self._H, _GHASH_IMPL)
+        ghash.update(_zero_pad(associated_data))
+        ghash.update(_zero_pad(ciphertext))
+        ghash.update(struct.pack('>QQ', len(associated_data) * 8, len(ciphertext) * 8))
+        return ghash.digest()
+    
+    def seal(self, nonce: bytes, associated_data: bytes, plaintext: bytes) -> bytes:
+        """Encrypt and authenticate; returns ciphertext + 16-byte tag"""
+        # Plain bytes slices throughout: memoryview/bytearray arguments cost
+        # more in PyCryptodome's ctypes calls than the small copies they save
+        length = len(plaintext)
+        stream = self._keystream(nonce, length)
+        ciphertext = strxor(plaintext, stream[16:16 + length]) if length else b""
+        tag = strxor(self._ghash(associated_data, ciphertext), stream[:16])
+        return ciphertext + tag
+    
+    def open(self, nonce: bytes, associated_data: bytes, ciphertext_tag: bytes) -> Optional[bytes]:
+        """Verify and decrypt; returns None if the tag does not verify"""
+        if len(ciphertext_tag) < 16:
+            raise ValueError("Ciphertext shorter than the 16-byte tag")
+        ciphertext = ciphertext_tag[:-16]
+        length = len(ciphertext)
+        stream = self._keystream(nonce, length)
+        tag = strxor(self._ghash(associated_data, ciphertext), stream[:16])
+        if not hmac.compare_digest(tag, ciphertext_tag[-16:]):
+            return None
+        return strxor(ciphertext, stream[16:16 + length]) if length else b""
+
+
+class _OpenSslGcm:
+    """
+    AES-128-GCM through cryptography's AESGCM one-shot API
+    
+    The AESGCM object holds the OpenSSL key schedule; each call is a single
+    encrypt/decrypt with no per-operation cipher or mode objects.
+    """
+    
+    __slots__ = ('_aead',)
+    
+    def __init__(self, key: bytes):
+        self._aead = AESGCM(key)
+    
+    def seal(self, nonce: bytes, associated_data: bytes, plaintext: bytes) -> bytes:
+        """Encrypt and authenticate; returns ciphertext + 16-byte tag"""
+        return self._aead.encrypt(nonce, plaintext, associated_data)
+    
+    def open(self, nonce: bytes, associated_data: bytes, ciphertext_tag: bytes) -> Optional[bytes]:
+        """Verify and decrypt; returns None if the tag does not verify"""
+        try:
+            return self._aead.decrypt(nonce, ciphertext_tag, associated_data)
+        except InvalidTag:
+            return None
 
 
 class AESLock(BaseCipher):
@@ -24,6 +131,8 @@ class AESLock(BaseCipher):
     ensuring both confidentiality and authenticity of unlock commands.
     """
     
+    __slots__ = ('key', '_gcm', '_nonces')
+    
     def __init__(self, key: Optional[bytes] = None):
         """
         Initialize AES-GCM lock with encryption key
@@ -37,6 +146,19 @@ class AESLock(BaseCipher):
             if len(key) != 16:
                 raise ValueError("AES-128 requires 16-byte (128-bit) key")
             self.key = key
+        
+        # Round keys and GHASH subkey are expanded once, not per operation
+        if AESNI_AVAILABLE:
+            self._gcm = AesGcm128(self.key)
+        elif AESGCM is not None:
+            self._gcm = _OpenSslGcm(self.key)
+        elif _GHASH is not None:
+            self._gcm = _CachedGcm(self.key)
+        else:
+            self._gcm = None
+        
+        # 96-bit nonces sliced from a buffered urandom pool
+        self._nonces = _NoncePool(width=12)
     
     def encrypt_command(
         self, 
@@ -57,7 +179,10 @@ class AESLock(BaseCipher):
             GCM uses 96-bit (12 byte) nonces as per NIST recommendation
         """
         # Generate unique 96-bit nonce (GCM standard)
-        nonce = os.urandom(12)
+        nonce = self._nonces.next()
+        
+        if self._gcm is not None:
+            return nonce, self._gcm.seal(nonce, associated_data, plaintext)
         
         # Create AES-GCM cipher instance
         cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
@@ -68,7 +193,9 @@ class AESLock(BaseCipher):
         # Encrypt and generate authentication tag
         ciphertext, tag = cipher.encrypt_and_digest(plaintext)
         
-        # Concatenate ciphertext and tag for unified output
+        # Concatenate ciphertext and tag for unified output. Writing into a
+        # preallocated bytearray via output= is slower here: PyCryptodome's
+        # ctypes backend pays a buffer-protocol round trip for non-bytes args
         return nonce, ciphertext + tag
     
     def decrypt_command(
@@ -92,6 +219,9 @@ class AESLock(BaseCipher):
             Returns None on authentication failure, preventing timing attacks
         """
         try:
+            if self._gcm is not None:
+                return self._gcm.open(nonce, associated_data, ciphertext_tag)
+            
             # Create AES-GCM cipher instance with same nonce
             cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
             
@@ -109,8 +239,44 @@ class AESLock(BaseCipher):
         except ValueError:
             # Authentication failed - tag mismatch or corrupted data
             # ValueError is raised by decrypt_and_verify on tag mismatch
+            # (and by the cached-key backends on malformed nonce/ciphertext)
             return None
     
+    def reserve_nonces(self, count: int):
+        """Buffer nonces for the next count encryptions"""
+        self._nonces.reserve(count)
+    
+    def encrypt_many(
+        self,
+        plaintexts: List[bytes],
+        associated_data: bytes
+    ) -> List[Tuple[bytes, bytes]]:
+        """Batch encryption in a single call into the AES-NI core"""
+        if not AESNI_AVAILABLE:
+            return super().encrypt_many(plaintexts, associated_data)
+        
+        # One urandom call for all nonces
+        pool = os.urandom(12 * len(plaintexts))
+        nonces = [pool[i:i + 12] for i in range(0, len(pool), 12)]
+        ciphertexts = self._gcm.seal_batch(nonces, associated_data, plaintexts)
+        return list(zip(nonces, ciphertexts))
+    
+    def decrypt_many(
+        self,
+        tokens: List[Tuple[bytes, bytes]],
+        associated_data: bytes
+    ) -> List[Optional[bytes]]:
+        """Batch decryption in a single call into the AES-NI core"""
+        if not AESNI_AVAILABLE or not tokens:
+            return super().decrypt_many(tokens, associated_data)
+        
+        nonces, ciphertexts = zip(*tokens)
+        try:
+            return self._gcm.open_batch(nonces, associated_data, ciphertexts)
+        except ValueError:
+            # A malformed token; let the per-message path map it to None
+            return super().decrypt_many(tokens, associated_data)
+    
     def get_algorithm_name(self) -> str:
         """Return algorithm identifier for benchmarking"""
         return "AES-128-GCM"
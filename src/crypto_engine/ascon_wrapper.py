@@ -11,9 +11,22 @@ Security Properties:
 - Associated data support (Lock ID binding)
 """
 import os
-import ascon
-from typing import Tuple, Optional
-from .base_cipher import BaseCipher
+from typing import List, Tuple, Optional
+from .base_cipher import BaseCipher, _NoncePool
+
+try:
+    # Compiled Ascon-128 core (build with: cythonize -i src/crypto_engine/_ascon_core.pyx)
+    from ._ascon_core import encrypt as _ascon_encrypt, decrypt as _ascon_decrypt
+    from ._ascon_core import encrypt_batch as _ascon_encrypt_batch
+    from ._ascon_core import decrypt_batch as _ascon_decrypt_batch
+except ImportError:
+    try:
+        # Numba-jitted permutation (no C toolchain needed)
+        from ._ascon_numba import encrypt as _ascon_encrypt, decrypt as _ascon_decrypt
+    except ImportError:
+        # Pure-Python fused 64-bit permutation (faster than the ascon package)
+        from ._ascon_swar import encrypt as _ascon_encrypt, decrypt as _ascon_decrypt
+    _ascon_encrypt_batch = _ascon_decrypt_batch = None
 
 
 class AsconLock(BaseCipher):
@@ -24,6 +37,8 @@ class AsconLock(BaseCipher):
     ensuring both confidentiality and authenticity of unlock commands.
     """
     
+    __slots__ = ('key', '_encrypt', '_decrypt', '_nonces')
+    
     def __init__(self, key: Optional[bytes] = None):
         """
         Initialize ASCON lock with encryption key
@@ -37,6 +52,13 @@ class AsconLock(BaseCipher):
             if len(key) != 16:
                 raise ValueError("ASCON-128 requires 16-byte (128-bit) key")
             self.key = key
+        
+        # Bound once so each operation is a single attribute lookup
+        self._encrypt = _ascon_encrypt
+        self._decrypt = _ascon_decrypt
+        
+        # 128-bit nonces sliced from a buffered urandom pool
+        self._nonces = _NoncePool(width=16)
     
     def encrypt_command(
         self, 
@@ -57,17 +79,10 @@ class AsconLock(BaseCipher):
             Nonce is generated fresh for each operation to prevent replay attacks
         """
         # Generate unique 128-bit nonce for this operation
-        nonce = os.urandom(16)
+        nonce = self._nonces.next()
         
         # ASCON-128 encryption with associated data
-        from ascon import encrypt as ascon_encrypt
-        ciphertext = ascon_encrypt(
-            key=self.key,
-            nonce=nonce,
-            associateddata=associated_data,
-            plaintext=plaintext,
-            variant="Ascon-128"
-        )
+        ciphertext = self._encrypt(self.key, nonce, associated_data, plaintext)
         
         return nonce, ciphertext
     
@@ -92,20 +107,48 @@ class AsconLock(BaseCipher):
             Returns None on authentication failure, preventing timing attacks
         """
         try:
-            from ascon import decrypt as ascon_decrypt
-            plaintext = ascon_decrypt(
-                key=self.key,
-                nonce=nonce,
-                associateddata=associated_data,
-                ciphertext=ciphertext,
-                variant="Ascon-128"
-            )
-            return plaintext
+            # All backends default to the Ascon-128 variant
+            return self._decrypt(self.key, nonce, associated_data, ciphertext)
         except Exception:
             # Authentication failed - tag mismatch or corrupted data
             # Return None instead of raising to prevent timing side-channels
             return None
     
+    def reserve_nonces(self, count: int):
+        """Buffer nonces for the next count encryptions"""
+        self._nonces.reserve(count)
+    
+    def encrypt_many(
+        self,
+        plaintexts: List[bytes],
+        associated_data: bytes
+    ) -> List[Tuple[bytes, bytes]]:
+        """Batch encryption in a single call into the compiled core"""
+        if _ascon_encrypt_batch is None:
+            return super().encrypt_many(plaintexts, associated_data)
+        
+        # One urandom call for all nonces
+        pool = os.urandom(16 * len(plaintexts))
+        nonces = [pool[i:i + 16] for i in range(0, len(pool), 16)]
+        ciphertexts = _ascon_encrypt_batch(self.key, nonces, associated_data, plaintexts)
+        return list(zip(nonces, ciphertexts))
+    
+    def decrypt_many(
+        self,
+        tokens: List[Tuple[bytes, bytes]],
+        associated_data: bytes
+    ) -> List[Optional[bytes]]:
+        """Batch decryption in a single call into the compiled core"""
+        if _ascon_decrypt_batch is None or not tokens:
+            return super().decrypt_many(tokens, associated_data)
+        
+        nonces, ciphertexts = zip(*tokens)
+        try:
+            return _ascon_decrypt_batch(self.key, nonces, associated_data, ciphertexts)
+        except ValueError:
+            # A malformed token; let the per-message path map it to None
+            return super().decrypt_many(tokens, associated_data)
+    
     def get_algorithm_name(self) -> str:
         """Return algorithm identifier for benchmarking"""
         return "ASCON-128"
@@ -1,8 +1,62 @@
 """
 Abstract base class for AEAD cipher implementations
 """
+import os
+import weakref
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+
+
+class _NoncePool:
+    """
+    Userspace buffer of CSPRNG bytes sliced into nonces
+    
+    One os.urandom call serves size // width nonces instead of one syscall
+    per nonce. Nonces are pre-sliced into a deque whose popleft is atomic,
+    so concurrent encryptions never share a nonce and no lock is needed;
+    forked children discard the parent's buffer.
+    """
+    
+    def __init__(self, size: int = 4096, width: int = 12):
+        self._width = width
+        self._size = size - size % width
+        self._queue: deque = deque()
+        _NONCE_POOLS.add(self)
+    
+    def next(self) -> bytes:
+        """Return the next unused nonce, refilling the buffer when exhausted"""
+        while True:
+            try:
+                return self._queue.popleft()
+            except IndexError:
+                self._refill()
+    
+    def reserve(self, count: int):
+        """Refill until at least count nonces are buffered"""
+        while len(self._queue) < count:
+            self._refill()
+    
+    def _refill(self):
+        buf = os.urandom(self._size)
+        width = self._width
+        self._queue.extend([buf[i:i + width] for i in range(0, len(buf), width)])
+    
+    def _discard(self):
+        self._queue.clear()
+
+
+_NONCE_POOLS: "weakref.WeakSet[_NoncePool]" = weakref.WeakSet()
+
+
+def _discard_nonce_pools():
+    """A forked child must never reuse nonces buffered by its parent"""
+    for pool in list(_NONCE_POOLS):
+        pool._discard()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_discard_nonce_pools)
 
 
 class BaseCipher(ABC):
@@ -13,6 +67,9 @@ class BaseCipher(ABC):
     the same contract for encryption/decryption operations.
     """
     
+    # Empty so that slotted subclasses carry no per-instance __dict__
+    __slots__ = ()
+    
     @abstractmethod
     def encrypt_command(
         self, 
@@ -50,3 +107,44 @@ class BaseCipher(ABC):
             Plaintext if authentication succeeds, None otherwise
         """
         pass
+    
+    def reserve_nonces(self, count: int):
+        """
+        Pre-generate nonces for the next count encryptions
+        
+        Lets profilers move nonce-buffer refills out of a measured region.
+        The default does nothing, for ciphers that draw nonces per call.
+        """
+        pass
+    
+    def encrypt_many(
+        self,
+        plaintexts: List[bytes],
+        associated_data: bytes
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Encrypt a batch of plaintexts sharing the same associated data
+        
+        Subclasses with a native backend override this to loop in C;
+        the default simply calls encrypt_command for each message.
+        
+        Returns:
+            List of (nonce, ciphertext_with_tag), in input order
+        """
+        return [self.encrypt_command(pt, associated_data) for pt in plaintexts]
+    
+    def decrypt_many(
+        self,
+        tokens: List[Tuple[bytes, bytes]],
+        associated_data: bytes
+    ) -> List[Optional[bytes]]:
+        """
+        Decrypt a batch of (nonce, ciphertext_with_tag) pairs
+        
+        Returns:
+            List of plaintexts (None where authentication fails), in input order
+        """
+        return [
+            self.decrypt_command(nonce, associated_data, ciphertext)
+            for nonce, ciphertext in tokens
+        ]
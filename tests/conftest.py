@@ -0,0 +1,24 @@
+"""
+Fixtures shared by the cipher test modules
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def plaintext():
+    """Typical unlock command"""
+    return b"unlock_bike_id_12345"
+
+
+@pytest.fixture(scope="session")
+def associated_data():
+    """Lock ID bound to every test token"""
+    return b"lock_station_A_slot_42"
+
+
+@pytest.fixture(scope="session")
+def random_key16():
+    """One random 128-bit key for the whole test session"""
+    return os.urandom(16)
@@ -0,0 +1,183 @@
+"""
+AEAD contract tests for every BaseCipher implementation
+
+Each test runs once per cipher through the parametrized `spec` fixture.
+Tests are independent and safe to distribute with pytest-xdist
+(`pytest -n auto`); each worker builds its own cipher fixtures.
+"""
+import os
+from typing import NamedTuple
+
+import pytest
+
+from crypto_engine import AESLock, AsconLock
+from crypto_engine.base_cipher import BaseCipher
+
+# 1 KB payload for the large-plaintext roundtrip case, built once at import
+_LARGE_PT = b"X" * 1024
+
+
+class CipherSpec(NamedTuple):
+    """A cipher under test and the values its contract depends on"""
+    cls: type            # BaseCipher subclass under test
+    nonce_len: int       # Nonce size in bytes
+    algo_name: str       # Expected get_algorithm_name()
+
+
+_SPECS = [
+    CipherSpec(AESLock, 12, "AES-128-GCM"),   # GCM uses 96-bit nonce
+    CipherSpec(AsconLock, 16, "ASCON-128"),   # 128-bit nonce
+]
+
+
+def _flip_bit(data: bytes, index: int) -> bytearray:
+    """Copy of data with the low bit of data[index] flipped"""
+    # decrypt_command accepts any bytes-like object, so no bytes() round trip
+    tampered = bytearray(data)
+    tampered[index] ^= 0x01
+    return tampered
+
+
+@pytest.fixture(scope="module", params=_SPECS, ids=lambda spec: spec.cls.__name__)
+def spec(request) -> CipherSpec:
+    """Each cipher implementation in turn"""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def cipher(spec) -> BaseCipher:
+    """One keyed cipher per implementation, shared by its tests"""
+    return spec.cls()
+
+
+@pytest.fixture(scope="module")
+def encrypted(cipher, plaintext, associated_data):
+    """One (nonce, ciphertext) pair shared by the rejection tests"""
+    return cipher.encrypt_command(plaintext, associated_data)
+
+
+def test_encryption_produces_output(spec, cipher, plaintext, associated_data):
+    """Test that encryption produces non-empty ciphertext"""
+    nonce, ciphertext = cipher.encrypt_command(
+        plaintext,
+        associated_data
+    )
+    
+    # One comparison; a None nonce or ciphertext fails in len()
+    assert (len(nonce), len(ciphertext)) == (spec.nonce_len, len(plaintext) + 16)
+
+
+@pytest.mark.parametrize("pt", [b"", b"unlock_bike_id_12345", _LARGE_PT],
+                         ids=["empty", "command", "1KB"])
+def test_roundtrip(cipher, associated_data, pt):
+    """Test encrypt -> decrypt returns the original plaintext"""
+    nonce, ciphertext = cipher.encrypt_command(pt, associated_data)
+    
+    # Ciphertext is the plaintext length plus the 16-byte tag
+    assert len(ciphertext) == len(pt) + 16
+    assert cipher.decrypt_command(nonce, associated_data, ciphertext) == pt
+
+
+def test_nonce_uniqueness(cipher, plaintext, associated_data):
+    """Test that nonces are unique across multiple encryptions"""
+    nonces = {
+        cipher.encrypt_command(plaintext, associated_data)[0]
+        for _ in range(100)
+    }
+    
+    assert len(nonces) == 100  # All unique
+
+
+def test_nonce_uniqueness_across_pool_refill(cipher, associated_data):
+    """Test that nonces stay unique when the nonce buffer is refilled"""
+    nonces = {
+        cipher.encrypt_command(b"", associated_data)[0]
+        for _ in range(1000)
+    }
+    
+    assert len(nonces) == 1000
+
+
+def test_reserve_nonces_prefills_pool(cipher, associated_data):
+    """Test that reserved nonces are buffered and stay unique"""
+    cipher.reserve_nonces(1000)
+    assert len(cipher._nonces._queue) >= 1000
+    
+    nonces = {
+        cipher.encrypt_command(b"", associated_data)[0]
+        for _ in range(1000)
+    }
+    
+    assert len(nonces) == 1000
+
+
+@pytest.mark.parametrize("mutate", [
+    # Flip one bit of the ciphertext body
+    lambda nonce, ad, ct: (nonce, ad, _flip_bit(ct, 0)),
+    # Flip one bit of the tag (last 16 bytes)
+    lambda nonce, ad, ct: (nonce, ad, _flip_bit(ct, -1)),
+    # Different associated data
+    lambda nonce, ad, ct: (nonce, b"different_lock_id", ct),
+    # Nonce one bit away from the one used to encrypt
+    lambda nonce, ad, ct: (_flip_bit(nonce, 0), ad, ct),
+], ids=["tampered_ciphertext", "tampered_tag", "wrong_associated_data", "wrong_nonce"])
+def test_authentication_failure(cipher, encrypted, associated_data, mutate):
+    """Test that any altered input fails authentication"""
+    nonce, ciphertext = encrypted
+    nonce, associated_data, ciphertext = mutate(nonce, associated_data, ciphertext)
+    
+    # Should return None (authentication failure)
+    assert cipher.decrypt_command(nonce, associated_data, ciphertext) is None
+
+
+def test_different_plaintexts_different_ciphertexts(cipher, associated_data):
+    """Test that different inputs produce different outputs"""
+    nonce1, ct1 = cipher.encrypt_command(
+        b"plaintext1",
+        associated_data
+    )
+    
+    nonce2, ct2 = cipher.encrypt_command(
+        b"plaintext2",
+        associated_data
+    )
+    
+    assert ct1 != ct2
+    assert nonce1 != nonce2  # Nonces should be different too
+
+
+def test_key_initialization_with_custom_key(spec, random_key16):
+    """Test initialization with custom key"""
+    cipher = spec.cls(key=random_key16)
+    
+    assert cipher.key == random_key16
+
+
+def test_key_initialization_invalid_size(spec):
+    """Test that invalid key size raises error"""
+    with pytest.raises(ValueError, match="requires 16-byte"):
+        spec.cls(key=b"short")  # Too short
+
+
+def test_batch_roundtrip_and_tamper(cipher, associated_data):
+    """Test encrypt_many/decrypt_many, with one tampered token"""
+    plaintexts = [os.urandom(size) for size in (0, 8, 20, 64)]
+    
+    tokens = cipher.encrypt_many(plaintexts, associated_data)
+    assert len({nonce for nonce, _ in tokens}) == len(plaintexts)
+    
+    nonce, ciphertext = tokens[2]
+    tokens[2] = (nonce, _flip_bit(ciphertext, 0))
+    
+    results = cipher.decrypt_many(tokens, associated_data)
+    
+    assert results == [plaintexts[0], plaintexts[1], None, plaintexts[3]]
+
+
+def test_algorithm_name(spec, cipher):
+    """Test algorithm name method"""
+    assert cipher.get_algorithm_name() == spec.algo_name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
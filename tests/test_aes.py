@@ -1,210 +1,131 @@
 """
 Unit tests for AES-128-GCM wrapper
 
-Tests encryption/decryption correctness, nonce uniqueness, 
-and authentication failure detection.
+The shared AEAD contract (roundtrip, nonce uniqueness, authentication
+failure detection) lives in test_aead_contract.py; this module checks
+interoperability with PyCryptodome's reference AES-GCM.
 """
 import pytest
 import os
-import sys
-
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from crypto_engine import AESLock
 
 
-class TestAESLock:
-    """Test suite for AES-128-GCM implementation"""
-    
-    def setup_method(self):
-        """Setup for each test"""
-        self.cipher = AESLock()
-        self.plaintext = b"unlock_bike_id_12345"
-        self.associated_data = b"lock_station_A_slot_42"
-    
-    def test_encryption_produces_output(self):
-        """Test that encryption produces non-empty ciphertext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext, 
-            self.associated_data
-        )
-        
-        assert nonce is not None
-        assert len(nonce) == 12  # GCM uses 96-bit nonce
-        assert ciphertext is not None
-        assert len(ciphertext) == len(self.plaintext) + 16  # +16 for tag
+@pytest.fixture(scope="module")
+def cipher():
+    """One keyed cipher shared by every test in this module"""
+    return AESLock()
+
+
+def test_matches_reference_implementation(cipher, associated_data):
+    """Test that output decrypts with PyCryptodome's AES-GCM"""
+    from Crypto.Cipher import AES
     
-    def test_decryption_roundtrip(self):
-        """Test encrypt -> decrypt returns original plaintext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
+    for size in (0, 15, 16, 20, 100):
+        plaintext = os.urandom(size)
+        nonce, ciphertext = cipher.encrypt_command(
+            plaintext,
+            associated_data
         )
         
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
+        reference = AES.new(cipher.key, AES.MODE_GCM, nonce=nonce)
+        reference.update(associated_data)
+        decrypted = reference.decrypt_and_verify(
+            ciphertext[:-16],
+            ciphertext[-16:]
         )
         
-        assert decrypted == self.plaintext
-    
-    def test_nonce_uniqueness(self):
-        """Test that nonces are unique across multiple encryptions"""
-        nonces = set()
-        
-        for _ in range(100):
-            nonce, _ = self.cipher.encrypt_command(
-                self.plaintext,
-                self.associated_data
-            )
-            nonces.add(nonce)
-        
-        assert len(nonces) == 100  # All unique
+        assert decrypted == plaintext
+
+
+_PT_LENGTHS = [0, 1, 7, 8, 15, 16, 17, 32, 100]
+_AD_LENGTHS = [0, 1, 16, 22]
+
+
+def _check_against_pycryptodome(backend, key):
+    """backend.seal/open must match PyCryptodome's AES-GCM byte for byte"""
+    from Crypto.Cipher import AES
     
-    def test_authentication_failure_tampered_ciphertext(self):
-        """Test that tampered ciphertext fails authentication"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Tamper with ciphertext (not the tag)
-        tampered = bytearray(ciphertext)
-        tampered[0] ^= 0x01  # Flip one bit
-        tampered = bytes(tampered)
-        
-        # Should return None (authentication failure)
-        result = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            tampered
-        )
-        
-        assert result is None
+    for ad_len in _AD_LENGTHS:
+        ad = os.urandom(ad_len)
+        for pt_len in _PT_LENGTHS:
+            nonce = os.urandom(12)
+            pt = os.urandom(pt_len)
+            reference = AES.new(key, AES.MODE_GCM, nonce=nonce)
+            reference.update(ad)
+            expected = b"".join(reference.encrypt_and_digest(pt))
+            
+            assert backend.seal(nonce, ad, pt) == expected
+            assert backend.open(nonce, ad, expected) == pt
+            
+            # Flip one bit of the tag
+            tampered = expected[:-1] + bytes([expected[-1] ^ 0x01])
+            assert backend.open(nonce, ad, tampered) is None
+
+
+def test_cached_gcm_matches_pycryptodome():
+    """Test the cached-key-schedule GCM path, whichever backend AESLock uses"""
+    from crypto_engine import aes_wrapper
     
-    def test_authentication_failure_tampered_tag(self):
-        """Test that tampered tag fails authentication"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Tamper with tag (last 16 bytes)
-        tampered = bytearray(ciphertext)
-        tampered[-1] ^= 0x01  # Flip one bit in tag
-        tampered = bytes(tampered)
-        
-        result = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            tampered
-        )
-        
-        assert result is None
+    # Fails loudly if PyCryptodome's private GHASH import stops working
+    assert aes_wrapper._GHASH is not None
     
-    def test_authentication_failure_wrong_associated_data(self):
-        """Test that wrong associated data fails authentication"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Use different associated data
-        wrong_ad = b"different_lock_id"
-        
-        result = self.cipher.decrypt_command(
-            nonce,
-            wrong_ad,
-            ciphertext
-        )
-        
-        assert result is None
+    key = os.urandom(16)
+    _check_against_pycryptodome(aes_wrapper._CachedGcm(key), key)
+
+
+def test_openssl_gcm_matches_pycryptodome():
+    """Test the cryptography AESGCM path, whichever backend AESLock uses"""
+    pytest.importorskip("cryptography")
+    from crypto_engine import aes_wrapper
     
-    def test_authentication_failure_wrong_nonce(self):
-        """Test that wrong nonce fails decryption"""
-        _, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Use different nonce
-        wrong_nonce = os.urandom(12)
-        
-        result = self.cipher.decrypt_command(
-            wrong_nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert result is None
+    key = os.urandom(16)
+    backend = aes_wrapper._OpenSslGcm(key)
+    _check_against_pycryptodome(backend, key)
     
-    def test_different_plaintexts_different_ciphertexts(self):
-        """Test that different inputs produce different outputs"""
-        nonce1, ct1 = self.cipher.encrypt_command(
-            b"plaintext1",
-            self.associated_data
-        )
-        
-        nonce2, ct2 = self.cipher.encrypt_command(
-            b"plaintext2",
-            self.associated_data
-        )
-        
-        assert ct1 != ct2
-        assert nonce1 != nonce2
-    
-    def test_empty_plaintext(self):
-        """Test encryption of empty plaintext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            b"",
-            self.associated_data
-        )
-        
-        # Ciphertext should only contain the tag (16 bytes)
-        assert len(ciphertext) == 16
-        
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert decrypted == b""
+    # InvalidTag must not escape: AESLock reports a failed check as None
+    lock = AESLock(key)
+    lock._gcm = backend
+    nonce, ciphertext = lock.encrypt_command(b"unlock", b"lock_id")
+    assert lock.decrypt_command(nonce, b"lock_id", ciphertext) == b"unlock"
+    assert lock.decrypt_command(nonce, b"other_id", ciphertext) is None
+
+
+
+def _aesni_core():
+    """The AES-NI/PCLMUL core module, skipping when unbuilt or unsupported"""
+    core = pytest.importorskip("crypto_engine._aesni")
+    if not core.AESNI_AVAILABLE:
+        pytest.skip("CPU does not support AES-NI/PCLMULQDQ")
+    return core
+
+
+def test_aesni_core_matches_pycryptodome():
+    """Test the AES-NI core directly; skipped when it is not built"""
+    core = _aesni_core()
     
-    def test_large_plaintext(self):
-        """Test encryption of larger plaintext (1KB)"""
-        large_plaintext = b"X" * 1024
-        
-        nonce, ciphertext = self.cipher.encrypt_command(
-            large_plaintext,
-            self.associated_data
-        )
-        
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert decrypted == large_plaintext
+    key = os.urandom(16)
+    _check_against_pycryptodome(core.AesGcm128(key), key)
+
+
+def test_aesni_core_batch_matches_single():
+    """Test that the AES-NI core's batch calls agree with one-message calls"""
+    core = _aesni_core()
     
-    def test_key_initialization_with_custom_key(self):
-        """Test initialization with custom key"""
-        custom_key = os.urandom(16)
-        cipher = AESLock(key=custom_key)
-        
-        assert cipher.key == custom_key
+    gcm = core.AesGcm128(os.urandom(16))
+    ad = os.urandom(22)
+    nonces = [os.urandom(12) for _ in _PT_LENGTHS]
+    plaintexts = [os.urandom(pt_len) for pt_len in _PT_LENGTHS]
     
-    def test_key_initialization_invalid_size(self):
-        """Test that invalid key size raises error"""
-        with pytest.raises(ValueError):
-            AESLock(key=b"short")  # Too short
+    ciphertexts = gcm.seal_batch(nonces, ad, plaintexts)
+    assert ciphertexts == [
+        gcm.seal(nonce, ad, pt) for nonce, pt in zip(nonces, plaintexts)
+    ]
     
-    def test_algorithm_name(self):
-        """Test algorithm name method"""
-        assert self.cipher.get_algorithm_name() == "AES-128-GCM"
+    # Flip one tag bit of one message; only that one fails
+    ciphertexts[4] = ciphertexts[4][:-1] + bytes([ciphertexts[4][-1] ^ 0x01])
+    expected = plaintexts[:4] + [None] + plaintexts[5:]
+    assert gcm.open_batch(nonces, ad, ciphertexts) == expected
 
 
 if __name__ == "__main__":
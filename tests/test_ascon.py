@@ -1,187 +1,110 @@
 """
 Unit tests for ASCON-128 wrapper
 
-Tests encryption/decryption correctness, nonce uniqueness, 
-and authentication failure detection.
+The shared AEAD contract (roundtrip, nonce uniqueness, authentication
+failure detection) lives in test_aead_contract.py; this module checks
+interoperability with the pure-Python ascon reference package.
 """
 import pytest
 import os
-import sys
-
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from crypto_engine import AsconLock
 
 
-class TestAsconLock:
-    """Test suite for ASCON-128 implementation"""
-    
-    def setup_method(self):
-        """Setup for each test"""
-        self.cipher = AsconLock()
-        self.plaintext = b"unlock_bike_id_12345"
-        self.associated_data = b"lock_station_A_slot_42"
-    
-    def test_encryption_produces_output(self):
-        """Test that encryption produces non-empty ciphertext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext, 
-            self.associated_data
-        )
-        
-        assert nonce is not None
-        assert len(nonce) == 16  # 128-bit nonce
-        assert ciphertext is not None
-        assert len(ciphertext) > len(self.plaintext)  # Includes tag
-    
-    def test_decryption_roundtrip(self):
-        """Test encrypt -> decrypt returns original plaintext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert decrypted == self.plaintext
-    
-    def test_nonce_uniqueness(self):
-        """Test that nonces are unique across multiple encryptions"""
-        nonces = set()
-        
-        for _ in range(100):
-            nonce, _ = self.cipher.encrypt_command(
-                self.plaintext,
-                self.associated_data
-            )
-            nonces.add(nonce)
-        
-        assert len(nonces) == 100  # All unique
-    
-    def test_authentication_failure_tampered_ciphertext(self):
-        """Test that tampered ciphertext fails authentication"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Tamper with ciphertext
-        tampered = bytearray(ciphertext)
-        tampered[0] ^= 0x01  # Flip one bit
-        tampered = bytes(tampered)
-        
-        # Should return None (authentication failure)
-        result = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            tampered
-        )
-        
-        assert result is None
+@pytest.fixture(scope="module")
+def cipher():
+    """One keyed cipher shared by every test in this module"""
+    return AsconLock()
+
+
+def test_matches_reference_implementation(cipher, associated_data):
+    """Test that output decrypts with the pure-Python ascon package"""
+    import ascon
     
-    def test_authentication_failure_wrong_associated_data(self):
-        """Test that wrong associated data fails authentication"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
+    for size in (0, 7, 8, 20, 64):
+        plaintext = os.urandom(size)
+        nonce, ciphertext = cipher.encrypt_command(
+            plaintext,
+            associated_data
         )
         
-        # Use different associated data
-        wrong_ad = b"different_lock_id"
-        
-        result = self.cipher.decrypt_command(
+        decrypted = ascon.decrypt(
+            cipher.key,
             nonce,
-            wrong_ad,
-            ciphertext
+            associated_data,
+            ciphertext,
+            variant="Ascon-128"
         )
         
-        assert result is None
+        assert decrypted == plaintext
+
+
+# Every partial-block length up to two rate blocks, plus a multi-block payload
+_PT_LENGTHS = list(range(18)) + [1024]
+_AD_LENGTHS = [0, 1, 8, 9]
+
+
+def _check_against_reference(backend):
+    """Encrypt/decrypt with backend and the ascon package; they must agree"""
+    import ascon
     
-    def test_authentication_failure_wrong_nonce(self):
-        """Test that wrong nonce fails decryption"""
-        _, ciphertext = self.cipher.encrypt_command(
-            self.plaintext,
-            self.associated_data
-        )
-        
-        # Use different nonce
-        wrong_nonce = os.urandom(16)
-        
-        result = self.cipher.decrypt_command(
-            wrong_nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert result is None
+    key = os.urandom(16)
+    nonce = os.urandom(16)
+    for ad_len in _AD_LENGTHS:
+        ad = os.urandom(ad_len)
+        for pt_len in _PT_LENGTHS:
+            pt = os.urandom(pt_len)
+            expected = ascon.encrypt(key, nonce, ad, pt, variant="Ascon-128")
+            
+            assert backend.encrypt(key, nonce, ad, pt) == expected
+            assert backend.decrypt(key, nonce, ad, expected) == pt
+            
+            # Flip one bit of the tag
+            tampered = expected[:-1] + bytes([expected[-1] ^ 0x01])
+            assert backend.decrypt(key, nonce, ad, tampered) is None
+
+
+def test_swar_backend_matches_reference():
+    """Test the pure-Python fallback directly, whichever backend AsconLock uses"""
+    from crypto_engine import _ascon_swar
     
-    def test_different_plaintexts_different_ciphertexts(self):
-        """Test that different inputs produce different outputs"""
-        nonce1, ct1 = self.cipher.encrypt_command(
-            b"plaintext1",
-            self.associated_data
-        )
-        
-        nonce2, ct2 = self.cipher.encrypt_command(
-            b"plaintext2",
-            self.associated_data
-        )
-        
-        assert ct1 != ct2
-        assert nonce1 != nonce2  # Nonces should be different too
+    _check_against_reference(_ascon_swar)
+
+
+def test_numba_backend_matches_reference():
+    """Test the numba-jitted backend directly, whichever backend AsconLock uses"""
+    pytest.importorskip("numba")
+    from crypto_engine import _ascon_numba
     
-    def test_empty_plaintext(self):
-        """Test encryption of empty plaintext"""
-        nonce, ciphertext = self.cipher.encrypt_command(
-            b"",
-            self.associated_data
-        )
-        
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert decrypted == b""
+    _check_against_reference(_ascon_numba)
+
+
+
+def test_compiled_core_matches_reference():
+    """Test the Cython core directly; skipped when it is not built"""
+    core = pytest.importorskip("crypto_engine._ascon_core")
     
-    def test_large_plaintext(self):
-        """Test encryption of larger plaintext (1KB)"""
-        large_plaintext = b"X" * 1024
-        
-        nonce, ciphertext = self.cipher.encrypt_command(
-            large_plaintext,
-            self.associated_data
-        )
-        
-        decrypted = self.cipher.decrypt_command(
-            nonce,
-            self.associated_data,
-            ciphertext
-        )
-        
-        assert decrypted == large_plaintext
+    _check_against_reference(core)
+
+
+def test_compiled_core_batch_matches_single():
+    """Test that the Cython core's batch calls agree with one-message calls"""
+    core = pytest.importorskip("crypto_engine._ascon_core")
     
-    def test_key_initialization_with_custom_key(self):
-        """Test initialization with custom key"""
-        custom_key = os.urandom(16)
-        cipher = AsconLock(key=custom_key)
-        
-        assert cipher.key == custom_key
+    key = os.urandom(16)
+    ad = os.urandom(9)
+    nonces = [os.urandom(16) for _ in _PT_LENGTHS]
+    plaintexts = [os.urandom(pt_len) for pt_len in _PT_LENGTHS]
     
-    def test_key_initialization_invalid_size(self):
-        """Test that invalid key size raises error"""
-        with pytest.raises(ValueError):
-            AsconLock(key=b"short")  # Too short
+    ciphertexts = core.encrypt_batch(key, nonces, ad, plaintexts)
+    assert ciphertexts == [
+        core.encrypt(key, nonce, ad, pt) for nonce, pt in zip(nonces, plaintexts)
+    ]
     
-    def test_algorithm_name(self):
-        """Test algorithm name method"""
-        assert self.cipher.get_algorithm_name() == "ASCON-128"
+    # Flip one tag bit of one message; only that one fails
+    ciphertexts[8] = ciphertexts[8][:-1] + bytes([ciphertexts[8][-1] ^ 0x01])
+    expected = plaintexts[:8] + [None] + plaintexts[9:]
+    assert core.decrypt_batch(key, nonces, ad, ciphertexts) == expected
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+"""
+Unit tests for the bicycle lock system
+
+Tests unlock token verification and the cache of recent successful
+verifications.
+"""
+import time
+
+import pytest
+
+import bicycle_lock_terminal
+from bicycle_lock_terminal import (
+    UNLOCK_HEADER, UNLOCK_TAG, BicycleLockSystem, UnlockToken
+)
+
+
+class _RejectingCipher:
+    """Stand-in cipher whose tag check always fails"""
+    
+    def decrypt_command(self, nonce, associated_data, ciphertext):
+        return None
+
+
+def _tamper(token):
+    """Token with one bit of its ciphertext flipped"""
+    ciphertext = bytearray(token.ciphertext)
+    ciphertext[0] ^= 0x01
+    return token._replace(ciphertext=bytes(ciphertext))
+
+
+def _seal(system, bike_id, command):
+    """Token for bike_id carrying an arbitrary, correctly encrypted command"""
+    record = system.database[bike_id]
+    nonce, ciphertext = system._ciphers[bike_id].encrypt_command(command, record.aad)
+    return UnlockToken(record.bike_id_bytes, nonce, ciphertext, b"ASCON")
+
+
+@pytest.fixture
+def system():
+    """ASCON lock system with two registered bikes"""
+    system = BicycleLockSystem("ASCON")
+    system.register_bicycle("BIKE-A")
+    system.register_bicycle("BIKE-B")
+    return system
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic_ns for the verification cache"""
+    now = [1_000_000_000]
+    monkeypatch.setattr(bicycle_lock_terminal.time, "monotonic_ns", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("aesni, flags, expected", [
+    (True, set(), "AES"),
+    (False, {"aes", "pclmulqdq", "sse4_2"}, "AES"),
+    (False, {"aes"}, "ASCON"),
+    (False, {"pclmulqdq"}, "ASCON"),
+    (False, set(), "ASCON"),
+], ids=["aesni_core", "cpu_flags", "aes_only", "pclmul_only", "no_flags"])
+def test_detect_best_algorithm(monkeypatch, aesni, flags, expected):
+    """Test algorithm auto-selection from AES-NI support and CPU flags"""
+    monkeypatch.setattr(bicycle_lock_terminal, "AESNI_AVAILABLE", aesni)
+    monkeypatch.setattr(bicycle_lock_terminal, "_cpu_flags", lambda: flags)
+    
+    assert bicycle_lock_terminal.detect_best_algorithm() == expected
+    
+    system = BicycleLockSystem(None)
+    assert system.algorithm == expected
+    assert system.auto_selected
+
+
+def test_explicit_algorithm_is_not_auto_selected(monkeypatch):
+    """Test that an explicit choice overrides detection"""
+    monkeypatch.setattr(bicycle_lock_terminal, "detect_best_algorithm", lambda: "AES")
+    
+    system = BicycleLockSystem("ascon")
+    assert system.algorithm == "ASCON"
+    assert not system.auto_selected
+
+
+def test_unsupported_algorithm_rejected():
+    """Test that an unknown algorithm fails at construction"""
+    with pytest.raises(ValueError, match="Unsupported algorithm"):
+        BicycleLockSystem("DES")
+
+
+def test_token_verifies_for_its_own_bike(system):
+    """Test that a freshly generated token is accepted"""
+    assert system.verify_unlock_token(system.generate_unlock_token("BIKE-A"))
+
+
+def test_token_for_one_bike_rejected_for_another(system):
+    """Test that bike A's unlock command never opens bike B"""
+    token = system.generate_unlock_token("BIKE-A")
+    
+    # Relabelled token: bike B's key and AAD fail the tag check
+    assert not system.verify_unlock_token(token._replace(bike_id=b"BIKE-B"))
+    
+    # Bike A's command sealed under bike B's key: authentic, wrong bike ID
+    command = UNLOCK_HEADER.pack(UNLOCK_TAG, time.time_ns()) + b"BIKE-A"
+    assert not system.verify_unlock_token(_seal(system, "BIKE-B", command))
+
+
+@pytest.mark.parametrize("length", [0, 8, UNLOCK_HEADER.size - 1, UNLOCK_HEADER.size])
+def test_truncated_command_rejected(system, length):
+    """Test that an authentic but truncated unlock command is rejected"""
+    command = UNLOCK_HEADER.pack(UNLOCK_TAG, time.time_ns()) + b"BIKE-A"
+    
+    assert not system.verify_unlock_token(_seal(system, "BIKE-A", command[:length]))
+
+
+def test_wrong_command_tag_rejected(system):
+    """Test that an authentic command with another tag is rejected"""
+    command = UNLOCK_HEADER.pack(b"LOCK\x00\x00\x00\x00", time.time_ns()) + b"BIKE-A"
+    
+    assert not system.verify_unlock_token(_seal(system, "BIKE-A", command))
+
+
+def test_unlock_token_string_key_access(system):
+    """Test that tokens are still readable like the former dict tokens"""
+    token = system.generate_unlock_token("BIKE-A")
+    
+    for field in UnlockToken._fields:
+        assert token[field] == getattr(token, field)
+    assert token["nonce"] == token[1] == token.nonce
+    assert token["algorithm"] == b"ASCON"
+    with pytest.raises(KeyError):
+        token["timestamp"]
+
+
+def test_cache_hit_within_ttl(system, clock):
+    """Test that a verified token is accepted again without decryption"""
+    token = system.generate_unlock_token("BIKE-A")
+    assert system.verify_unlock_token(token)
+    
+    # Any further decryption would now fail; only the cache can accept it
+    system._ciphers["BIKE-A"] = _RejectingCipher()
+    clock[0] += BicycleLockSystem.VERIFY_CACHE_TTL_NS
+    
+    assert system.verify_unlock_token(token)
+
+
+def test_cache_entry_expires_after_ttl(system, clock):
+    """Test that a cached verification is dropped once its TTL has passed"""
+    token = system.generate_unlock_token("BIKE-A")
+    assert system.verify_unlock_token(token)
+    
+    system._ciphers["BIKE-A"] = _RejectingCipher()
+    clock[0] += BicycleLockSystem.VERIFY_CACHE_TTL_NS + 1
+    
+    assert not system.verify_unlock_token(token)
+    assert len(system._verified) == 0
+
+
+def test_cache_evicts_least_recently_used(system, clock, monkeypatch):
+    """Test that the oldest entry is evicted once the cache is full"""
+    monkeypatch.setattr(BicycleLockSystem, "VERIFY_CACHE_SIZE", 2)
+    tokens = [system.generate_unlock_token("BIKE-A") for _ in range(3)]
+    
+    assert system.verify_unlock_token(tokens[0])
+    assert system.verify_unlock_token(tokens[1])
+    # Touch the first token so the second becomes least recently used
+    assert system.verify_unlock_token(tokens[0])
+    assert system.verify_unlock_token(tokens[2])
+    assert len(system._verified) == 2
+    
+    system._ciphers["BIKE-A"] = _RejectingCipher()
+    assert system.verify_unlock_token(tokens[0])
+    assert not system.verify_unlock_token(tokens[1])
+    assert system.verify_unlock_token(tokens[2])
+
+
+def test_tampered_token_is_never_cached(system, clock):
+    """Test that a failed verification leaves no cache entry"""
+    tampered = _tamper(system.generate_unlock_token("BIKE-A"))
+    
+    assert not system.verify_unlock_token(tampered)
+    assert not system.verify_unlock_token(tampered)
+    assert len(system._verified) == 0
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_verify_tokens_parallel_keeps_input_order(system, max_workers):
+    """Test mixed valid, tampered and unknown-bike tokens map to results in order"""
+    valid_a = system.generate_unlock_token("BIKE-A")
+    valid_b = system.generate_unlock_token("BIKE-B")
+    unknown = UnlockToken(b"BIKE-Z", valid_a.nonce, valid_a.ciphertext, valid_a.algorithm)
+    tokens = [valid_a, _tamper(valid_b), unknown, valid_b,
+              _tamper(valid_a), valid_a, unknown]
+    
+    results = system.verify_tokens_parallel(tokens, max_workers=max_workers)
+    
+    assert results == [True, False, False, True, False, True, False]
+
+
+def test_verify_tokens_parallel_empty(system):
+    """Test that an empty batch verifies to an empty list"""
+    assert system.verify_tokens_parallel([]) == []
+    assert system.verify_tokens_parallel([], max_workers=4) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])